@@ -0,0 +1,159 @@
+"""
+Benchmarks for the chart and simulation code.
+
+    python -m benchmarks.run_benchmarks [--quick] [--output FILE]
+                                        [--baseline FILE] [--tolerance 0.2]
+
+Every chart function is timed at several dpi values and cabin sizes, and
+the simulator at several replicate counts per strategy. Each case reports
+the best wall time over its repeats and the peak traced memory of one
+extra run. Results go to a JSON file; with --baseline, cases more than
+tolerance slower than the baseline are reported as regressions and the
+exit status is 1.
+"""
+import argparse
+from contextlib import chdir
+from datetime import datetime, timezone
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from models.boarding_simulation import SECONDS_PER_TICK, simulate_boarding_batch
+from models.cabin_layout import LAYOUTS
+from models.seat_assignments import STRATEGIES, clear_cache, strategy_assignment
+from visualizations.aircraft_layout import create_aircraft_seating_chart
+from visualizations.boarding_strategies import (
+    back_to_front_strategy, outside_in_strategy, hybrid_strategy, random_boarding)
+
+CHARTS = [create_aircraft_seating_chart, back_to_front_strategy, outside_in_strategy,
+          hybrid_strategy, random_boarding]
+
+# (layouts, dpi values, replicate counts, repeats) for a full and a quick run
+FULL = (('b737', 'a350', 'a380'), (72, 150, 300), (1, 100, 1000), 3)
+QUICK = (('b737', 'a380'), (72, 300), (1, 100), 1)
+
+def measure(run, repeats):
+    """
+    Best wall time of run() over repeats, plus the peak traced memory of
+    one more call in MiB. Returns (seconds, peak_mib, result of last call).
+    """
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = run()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return min(times), peak / 2**20, result
+
+def chart_benchmarks(layouts, dpis, repeats):
+    """
+    Time every chart function for each layout and dpi. Figures are written
+    to a temporary directory.
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as directory, chdir(directory):
+        for key in layouts:
+            layout = LAYOUTS[key]
+            for dpi in dpis:
+                for chart in CHARTS:
+                    # Cold assignment cache every time, as in a fresh process
+                    def run():
+                        clear_cache()
+                        chart(layout, dpi=dpi)
+
+                    seconds, peak, _ = measure(run, repeats)
+                    results[f"chart/{chart.__name__}/{key}/dpi{dpi}"] = {
+                        'seconds': seconds,
+                        'peak_mib': peak,
+                        'seats': layout.n_seats,
+                    }
+    return results
+
+def simulation_benchmarks(layouts, replicate_counts, repeats):
+    """
+    Throughput of simulate_boarding_batch per layout, strategy and
+    replicate count: boardings and passenger-ticks per second.
+    """
+    results = {}
+    for key in layouts:
+        layout = LAYOUTS[key]
+        for strategy in STRATEGIES:
+            rank = strategy_assignment(strategy, layout).rank
+            for n_replicates in replicate_counts:
+                def run():
+                    return simulate_boarding_batch(layout, rank, n_replicates, seed=0)
+
+                seconds, peak, result = measure(run, repeats)
+                ticks = np.sum(result['minutes'] * 60 / SECONDS_PER_TICK)
+                results[f"simulation/{strategy}/{key}/x{n_replicates}"] = {
+                    'seconds': seconds,
+                    'peak_mib': peak,
+                    'boardings_per_second': n_replicates / seconds,
+                    'passenger_ticks_per_second': float(ticks * layout.n_seats / seconds),
+                }
+    return results
+
+def compare(results, baseline, tolerance=0.2):
+    """
+    Cases present in both runs whose time grew by more than tolerance
+    (a fraction), as {name: (baseline seconds, seconds)}.
+    """
+    return {name: (baseline[name]['seconds'], case['seconds'])
+            for name, case in results.items()
+            if name in baseline and case['seconds'] > baseline[name]['seconds'] * (1 + tolerance)}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark chart rendering and simulation.")
+    parser.add_argument('--quick', action='store_true', help="fewer cases and one repeat")
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--baseline', help="earlier results file to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="allowed slowdown before a case counts as a regression")
+    parser.add_argument('--skip-charts', action='store_true')
+    parser.add_argument('--skip-simulation', action='store_true')
+    args = parser.parse_args(argv)
+
+    layouts, dpis, replicate_counts, repeats = QUICK if args.quick else FULL
+    results = {}
+    if not args.skip_charts:
+        results.update(chart_benchmarks(layouts, dpis, repeats))
+    if not args.skip_simulation:
+        results.update(simulation_benchmarks(layouts, replicate_counts, repeats))
+
+    for name, case in results.items():
+        print(f"{name}: {case['seconds'] * 1000:.1f} ms, peak {case['peak_mib']:.1f} MiB")
+
+    report = {
+        'created': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f)['results'], args.tolerance)
+        for name, (before, after) in regressions.items():
+            print(f"REGRESSION {name}: {before * 1000:.1f} ms -> {after * 1000:.1f} ms")
+        if regressions:
+            return 1
+        print(f"No regressions against {args.baseline}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
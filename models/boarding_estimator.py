@@ -0,0 +1,192 @@
+from collections import namedtuple
+
+import numpy as np
+
+from models.boarding_optimizer import _mutate, evaluate_ranks
+from models.cabin_layout import (
+    AIRBUS_A350_900, AIRBUS_A380_MAIN_DECK, BOEING_737_800, BOEING_777_300ER)
+from models.seat_assignments import STRATEGIES
+
+# aisle_factor: rows of aisle a passenger's queue gap covers (see blocking_chain)
+# intercept, scale: minutes = intercept + scale * chain length in ticks
+EstimatorParams = namedtuple('EstimatorParams', ['aisle_factor', 'intercept', 'scale'])
+
+# Fitted with calibrate() on each preset with the default simulator settings;
+# the parameters do not carry over between layouts
+CALIBRATED_PARAMS = {
+    BOEING_737_800: EstimatorParams(aisle_factor=0.5, intercept=4.98, scale=0.0139),
+    AIRBUS_A350_900: EstimatorParams(aisle_factor=0.25, intercept=7.11, scale=0.0151),
+    BOEING_777_300ER: EstimatorParams(aisle_factor=0.25, intercept=7.76, scale=0.0144),
+    AIRBUS_A380_MAIN_DECK: EstimatorParams(aisle_factor=0.25, intercept=11.41, scale=0.0144),
+}
+
+def layout_params(layout):
+    """
+    Calibrated EstimatorParams of a preset layout. Other layouts have to
+    be calibrated first: pass calibrate(layout)['params'].
+    """
+    if layout not in CALIBRATED_PARAMS:
+        raise ValueError(f"no calibrated estimator params for {layout.name}; "
+                         f"pass calibrate(layout)['params']")
+    return CALIBRATED_PARAMS[layout]
+
+def _chain_finish(rows, lanes, reach, cost, n_lanes):
+    """
+    Finish tick of the longest blocking chain of one queue order (see
+    blocking_chain). Every passenger is one update and one query of a
+    prefix-maximum Fenwick tree per aisle over reach, so this is
+    O(n log n).
+    """
+    # Positions in the trees: equal reach shares one slot so it counts as waiting
+    values, slot = np.unique(reach, return_inverse=True)
+    size = len(values)
+    # Per aisle, the longest finish and finish minus row over every reach slot
+    finish_tree = [[-np.inf] * (size + 1) for _ in range(n_lanes)]
+    slack_tree = [[-np.inf] * (size + 1) for _ in range(n_lanes)]
+
+    longest = 0.0
+    for k, (row, lane, i, c) in enumerate(zip(rows.tolist(), lanes.tolist(),
+                                              (slot + 1).tolist(), cost.tolist())):
+        # Waiting for j costs finish_j + max(row - row_j, 0), the larger of the two terms
+        finishes = finish_tree[lane]
+        slacks = slack_tree[lane]
+        ready = -np.inf
+        j = i
+        while j > 0:
+            ready = max(ready, finishes[j], row + slacks[j])
+            j -= j & -j
+        finish = max(k + row + 1, ready) + c
+        longest = max(longest, finish)
+
+        j = i
+        while j <= size:
+            if finish > finishes[j]:
+                finishes[j] = finish
+            if finish - row > slacks[j]:
+                slacks[j] = finish - row
+            j += j & -j
+    return longest
+
+def blocking_chain(layout, rank, aisle_factor=0.5, n_samples=16, seed=0,
+                   luggage_rate=0.8, stow_ticks=(6, 20), shuffle_ticks=6):
+    """
+    Mean length in ticks of the longest blocking chain of a (rows x seats)
+    rank array, over n_samples queue orders.
+
+    In queue order, passenger k waits for an earlier passenger j on the
+    same aisle when k's row is at least j's row minus aisle_factor times
+    their distance in the queue: passengers in between stack up in the
+    aisle behind j while j stows, so j holds up k even if k's row is
+    slightly in front of j's. A chain is a sequence of such waits; each
+    link costs the expected stowing time plus shuffle_ticks per seated
+    passenger in the way, and a chain can start no earlier than its first
+    passenger walks in from the door. This is a weighted longest-increasing-
+    subsequence over (queue position, row), found in O(n log n) per queue
+    order without simulating anyone.
+    """
+    rank = np.asarray(rank)
+    n = rank.size
+    rng = np.random.default_rng(seed)
+    seat_rows, seat_cols = np.indices(rank.shape).reshape(2, -1)
+    order = np.argsort(rank.ravel() + rng.random((n_samples, n)), axis=1)
+    rows = seat_rows[order]
+    cols = seat_cols[order]
+    lanes = layout.seat_aisle[cols]
+
+    # Seated passengers each one has to get past: same row, in the way, boarded earlier
+    queued = np.empty_like(order)
+    np.put_along_axis(queued, order, np.arange(n), axis=1)
+    queued = queued.reshape(n_samples, *rank.shape)
+    earlier = queued[:, :, None, :] < queued[:, :, :, None]  # (samples x rows x seats x seats)
+    in_the_way = (earlier & layout.blocking_mask).sum(axis=3).reshape(n_samples, n)
+    stow = luggage_rate * (stow_ticks[0] + stow_ticks[1]) / 2 + (1 - luggage_rate)
+    cost = stow + shuffle_ticks * np.take_along_axis(in_the_way, order, axis=1)
+
+    reach = rows + aisle_factor * np.arange(n)
+    return np.mean([_chain_finish(rows[i], lanes[i], reach[i], cost[i], layout.n_aisles)
+                    for i in range(n_samples)])
+
+def estimate_boarding(layout, rank, params=None, **chain_params):
+    """
+    Approximate expected boarding time in minutes of a rank array, from
+    its blocking chain and calibrated params (layout_params by default).
+    Takes 4-16 ms on the preset cabins, for screening candidates before
+    simulating them.
+    """
+    if params is None:
+        params = layout_params(layout)
+    chain = blocking_chain(layout, rank, params.aisle_factor, **chain_params)
+    return params.intercept + params.scale * chain
+
+def screen_candidates(layout, ranks, n_top=5, params=None, n_replicates=200,
+                      seed=0, **sim_params):
+    """
+    Estimate every rank array in ranks and simulate only the n_top with
+    the lowest estimates (one evaluate_ranks batch). Returns the indices
+    of those candidates, best simulated first, with their estimated and
+    simulated mean boarding times in minutes.
+    """
+    estimates = np.array([estimate_boarding(layout, rank, params, **sim_params)
+                          for rank in ranks])
+    top = np.argsort(estimates)[:n_top]
+    minutes = evaluate_ranks(layout, [ranks[i] for i in top], n_replicates, seed, **sim_params)
+    best = np.argsort(minutes)
+    return top[best], estimates[top][best], minutes[best]
+
+def calibrate(layout=BOEING_737_800, n_candidates=40, n_replicates=300, seed=0,
+              aisle_factors=(0.125, 0.25, 0.5, 0.75, 1.0, 2.0), **sim_params):
+    """
+    Fit EstimatorParams to the simulator on one layout.
+
+    The calibration set is the fixed strategies plus n_candidates random
+    variations of them (as the optimizer would propose), all simulated
+    with common random numbers. For each aisle_factor the intercept and
+    scale are fitted by least squares; the factor with the smallest
+    error wins. Returns the params, the root-mean-square error in minutes
+    over the whole set and {strategy: (estimated, simulated)} minutes.
+    """
+    rng = np.random.default_rng(seed)
+    starts = [build(layout).rank for build in STRATEGIES.values()]
+    n_groups = max(int(rank.max()) for rank in starts) + 1
+    ranks = starts + [_mutate(starts[rng.integers(len(starts))], rng, n_groups)
+                      for _ in range(n_candidates)]
+    minutes = evaluate_ranks(layout, ranks, n_replicates, seed, **sim_params)
+
+    best = None
+    for aisle_factor in aisle_factors:
+        chains = np.array([blocking_chain(layout, rank, aisle_factor, **sim_params)
+                           for rank in ranks])
+        design = np.column_stack([np.ones(len(ranks)), chains])
+        (intercept, scale), *_ = np.linalg.lstsq(design, minutes, rcond=None)
+        rmse = np.sqrt(np.mean((design @ (intercept, scale) - minutes) ** 2))
+        if best is None or rmse < best[0]:
+            best = (rmse, EstimatorParams(aisle_factor, float(intercept), float(scale)), chains)
+
+    rmse, params, chains = best
+    estimates = params.intercept + params.scale * chains
+    return {
+        'params': params,
+        'rmse': float(rmse),
+        'strategies': {name: (float(estimates[i]), float(minutes[i]))
+                       for i, name in enumerate(STRATEGIES)},
+    }
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    from models.cabin_layout import LAYOUTS
+
+    layout = LAYOUTS[sys.argv[1] if len(sys.argv) > 1 else 'b737']
+    result = calibrate(layout)
+    params = result['params']
+    print(f"{layout.name}: aisle_factor {params.aisle_factor}, "
+          f"minutes = {params.intercept:.2f} + {params.scale:.4f} x chain ticks, "
+          f"RMSE {result['rmse']:.2f} minutes")
+    for name, (estimated, simulated) in result['strategies'].items():
+        print(f"{name}: estimated {estimated:.2f}, simulated {simulated:.2f} minutes "
+              f"({(estimated - simulated) / simulated:+.1%})")
+
+    start = time.perf_counter()
+    estimate_boarding(layout, STRATEGIES['hybrid'](layout).rank, params)
+    print(f"One estimate takes {(time.perf_counter() - start) * 1000:.1f} ms")
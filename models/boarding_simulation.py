@@ -0,0 +1,368 @@
+from statistics import NormalDist
+import time
+
+import numpy as np
+
+SECONDS_PER_TICK = 1.0
+
+# Phases of a tick, as timed by the profiling mode of run_boarding
+PHASES = ('sit', 'stow', 'door', 'walk', 'arrive', 'skip')
+
+def boarding_sequence(rank, rng=None, n_replicates=None, load_factor=1.0):
+    """
+    Build the passenger queue for one boarding from a (rows x seats) array
+    of boarding ranks, e.g. SeatAssignment.rank (0 boards first).
+    Passengers within a rank are shuffled. With load_factor < 1 only that
+    fraction of the seats (rounded) is taken, chosen at random. Returns
+    row and column indices in queue order, with a leading replicate axis
+    if n_replicates is given.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    seat_rows, seat_cols = np.indices(rank.shape).reshape(2, -1)
+    seat_rank = rank.ravel()
+
+    # Sort by rank, breaking ties with a random key in [0, 1)
+    shape = (1 if n_replicates is None else n_replicates, len(seat_rank))
+    key = seat_rank + rng.random(shape)
+    n_passengers = round(load_factor * len(seat_rank))
+    if n_passengers < len(seat_rank):
+        # Empty seats sort last and are dropped
+        empty = np.argsort(rng.random(shape), axis=1)[:, n_passengers:]
+        np.put_along_axis(key, empty, np.inf, axis=1)
+    order = np.argsort(key, axis=1)[:, :n_passengers]
+    if n_replicates is None:
+        order = order[0]
+    return seat_rows[order], seat_cols[order]
+
+def sample_stow_ticks(rng, shape, luggage_rate, stow_ticks):
+    """
+    Sample stowing time per passenger; passengers without luggage take one tick.
+    """
+    has_luggage = rng.random(shape) < luggage_rate
+    return np.where(has_luggage, rng.integers(stow_ticks[0], stow_ticks[1] + 1, shape), 1)
+
+def _schedule(events, times, passengers):
+    """
+    Add passengers to the per-tick event buckets at the given ticks.
+    """
+    if len(passengers) == 0:
+        return
+    order = np.argsort(times, kind='stable')
+    times = times[order]
+    passengers = passengers[order]
+    ticks, starts = np.unique(times, return_index=True)
+    for tick, chunk in zip(ticks.tolist(), np.split(passengers, starts[1:])):
+        events.setdefault(tick, []).append(chunk)
+
+def _pop(events, t):
+    """
+    Remove and return the passengers scheduled for tick t.
+    """
+    chunks = events.pop(t, None)
+    if chunks is None:
+        return np.empty(0, dtype=np.intp)
+    return chunks[0] if len(chunks) == 1 else np.concatenate(chunks)
+
+def _door_open(aisle, cell_base, first, next_in_queue, n):
+    """
+    Replicates whose next queued passenger can step into the first cell of
+    their aisle this tick.
+    """
+    waiting = np.flatnonzero(next_in_queue < n)
+    head = first[waiting] + next_in_queue[waiting]
+    return waiting[aisle[cell_base[head]] < 0]
+
+def _lap(phase_seconds, phase, since):
+    """
+    Add the time since a perf_counter reading to a phase; return the new reading.
+    """
+    now = time.perf_counter()
+    phase_seconds[phase] += now - since
+    return now
+
+def run_boarding(layout, target, seat_col, stow, shuffle_ticks=6, max_ticks=100000,
+                 instruments=None):
+    """
+    Advance a batch of independent boardings of a cabin layout until
+    everyone is seated.
+
+    target, seat_col and stow are (replicates x passengers) arrays in queue
+    order. Passengers enter through the door at the front of the cabin one
+    per tick (layout.doors is ignored), step into the aisle serving their seat and walk one row per
+    tick, moving only into an aisle cell that was free at the start of the
+    tick. A passenger whose aisle is blocked at the door holds up the queue.
+    At their row they block the aisle while stowing luggage and while the
+    passengers already seated between the aisle and their seat get up
+    (shuffle_ticks per blocking passenger).
+
+    All state is kept in flat arrays over replicates x passengers (and
+    replicates x aisles x rows for the aisles, and one packed occupancy
+    word per row, see CabinLayout.blocker_lookup) and updated for every
+    replicate at once. Returns the tick at which each passenger sat down.
+
+    instruments, from models.instrumentation.new_instruments, switches on
+    counters that are filled in place; without it the loop only pays for
+    a few `is None` checks per tick.
+    """
+    n_replicates, n = target.shape
+    n_rows = layout.n_rows
+    n_aisles = layout.n_aisles
+
+    # Passenger state, flattened so passenger p belongs to replicate p // n;
+    # compact input dtypes (e.g. population columns) are widened so tick
+    # arithmetic cannot overflow
+    target = target.astype(np.intp).ravel()
+    seat_col = seat_col.astype(np.intp).ravel()
+    stow = stow.astype(np.intp).ravel()
+    replicate = np.repeat(np.arange(n_replicates), n)
+    lane = replicate * n_aisles + layout.seat_aisle[seat_col]
+    cell_base = lane * n_rows  # Offset of the passenger's aisle
+    row_slot = replicate * n_rows + target  # Replicate's row holding the seat
+    position = np.full(n_replicates * n, -1)
+    seated_at = np.zeros(n_replicates * n, dtype=int)
+
+    # Cabin state
+    aisle = np.full(n_replicates * n_aisles * n_rows, -1)  # Passenger in each cell, -1 if free
+    occupied = np.zeros(n_replicates * n_rows, dtype=np.uint32)  # Taken seats of each row, packed
+    seat_bit = layout.seat_bits[seat_col]
+    shift, blocker_table = layout.blocker_lookup
+    side_mask = np.uint32(blocker_table.shape[1] - 1)
+    blocker_table = blocker_table.astype(int)  # Keeps blockers * shuffle_ticks from wrapping
+    first = np.arange(n_replicates) * n
+    next_in_queue = np.zeros(n_replicates, dtype=int)
+    walkers = np.empty(0, dtype=np.intp)
+    stow_events = {}
+    sit_events = {}
+    n_seated = 0
+
+    # Opt-in counters, preallocated by the caller
+    counting = instruments is not None
+    if counting:
+        blocked_ticks = instruments['blocked_ticks']
+        blocked_cells = instruments['blocked_cells'].reshape(-1)
+        shuffles = instruments['shuffles'].reshape(-1)
+        door_queue = instruments['door_queue']
+        horizon = door_queue.shape[1]
+        phase_seconds = instruments['phase_seconds']
+    profiling = counting and phase_seconds is not None
+    if profiling:
+        clock = time.perf_counter()
+
+    def sit(done):
+        # Several passengers can take seats in the same row in one tick
+        np.bitwise_or.at(occupied, row_slot[done], seat_bit[done])
+        aisle[cell_base[done] + position[done]] = -1
+        return len(done)
+
+    t = 0
+    while n_seated < len(target):
+        if t >= max_ticks:
+            raise RuntimeError(f"Boarding did not finish within {max_ticks} ticks")
+
+        # Passengers whose row has finished shuffling sit down
+        n_seated += sit(_pop(sit_events, t))
+        if profiling:
+            clock = _lap(phase_seconds, 'sit', clock)
+
+        # Finished stowing: seated passengers in the way have to get up
+        stowed = _pop(stow_events, t)
+        if len(stowed):
+            cols = seat_col[stowed]
+            blockers = blocker_table[cols, (occupied[row_slot[stowed]] >> shift[cols]) & side_mask]
+            seated_at[stowed] = t + blockers * shuffle_ticks
+            now = seated_at[stowed] <= t
+            n_seated += sit(stowed[now])
+            _schedule(sit_events, seated_at[stowed[~now]], stowed[~now])
+            if counting:
+                shuffles[stowed] = blockers
+        if profiling:
+            clock = _lap(phase_seconds, 'stow', clock)
+
+        # Next passenger in each queue steps into their aisle if it was free
+        entering = _door_open(aisle, cell_base, first, next_in_queue, n)
+        if counting and t < horizon:
+            door_queue[:, t] = n - next_in_queue
+        if profiling:
+            clock = _lap(phase_seconds, 'door', clock)
+
+        # Walkers advance into cells that are free at the start of the tick
+        free_ahead = aisle[cell_base[walkers] + position[walkers] + 1] < 0
+        movers = walkers[free_ahead]
+        if counting:
+            # Held up by whoever is in the next cell: count it against that cell
+            held = walkers[~free_ahead]
+            np.add.at(blocked_cells, cell_base[held] + position[held] + 1, 1)
+        aisle[cell_base[movers] + position[movers]] = -1
+        position[movers] += 1
+        aisle[cell_base[movers] + position[movers]] = movers
+
+        if len(entering):
+            new = first[entering] + next_in_queue[entering]
+            position[new] = 0
+            aisle[cell_base[new]] = new
+            next_in_queue[entering] += 1
+            walkers = np.concatenate((walkers, new))
+        if profiling:
+            clock = _lap(phase_seconds, 'walk', clock)
+
+        # Passengers who reached their row start stowing
+        at_row = position[walkers] == target[walkers]
+        arrived = walkers[at_row]
+        walkers = walkers[~at_row]
+        _schedule(stow_events, t + 1 + stow[arrived], arrived)
+        if profiling:
+            clock = _lap(phase_seconds, 'arrive', clock)
+
+        # Nothing can move until the next stow or sit event: skip ahead
+        t += 1
+        if len(walkers) == 0 and not len(_door_open(aisle, cell_base, first, next_in_queue, n)):
+            pending = [tick for tick in (stow_events.keys() | sit_events.keys()) if tick >= t]
+            if pending:
+                resume = min(pending)
+                if counting:
+                    # The queue cannot change while nobody moves
+                    door_queue[:, t:resume] = (n - next_in_queue)[:, None]
+                t = resume
+        if profiling:
+            clock = _lap(phase_seconds, 'skip', clock)
+
+    if counting:
+        if t < horizon:
+            door_queue[:, t:] = 0
+        blocked_ticks += blocked_cells.reshape(n_replicates, n_aisles, n_rows).sum(axis=1)
+    return seated_at.reshape(n_replicates, n)
+
+def run_common(layout, ranks, ties, stow, shuffle_ticks=6, max_ticks=100000):
+    """
+    Board the same passengers under several boarding orders, all as one
+    run_boarding batch. ranks is a (candidates x seats) array of flattened
+    rank arrays; ties and stow are (replicates x seats) tie-breaking keys
+    in [0, 1) and stowing ticks per seat, shared by every candidate, so
+    differences between candidates come from the order alone. Returns the
+    completion tick of every boarding as (candidates x replicates).
+    """
+    ranks = np.asarray(ranks).reshape(len(ranks), -1)
+    n_candidates, n_seats = ranks.shape
+    n_replicates = len(ties)
+    seat_rows, seat_cols = np.indices((layout.n_rows, layout.n_cols)).reshape(2, -1)
+
+    # Queue order of every replicate of every candidate: (candidates x replicates, seats)
+    order = np.argsort(ranks[:, None, :] + ties, axis=2).reshape(-1, n_seats)
+    stow = np.take_along_axis(np.tile(stow, (n_candidates, 1)), order, axis=1)
+    seated_at = run_boarding(layout, seat_rows[order], seat_cols[order], stow, shuffle_ticks,
+                             max_ticks)
+    return seated_at.max(axis=1).reshape(n_candidates, n_replicates)
+
+def simulate_boarding(layout, rank, rng=None, luggage_rate=0.8, stow_ticks=(6, 20),
+                      shuffle_ticks=6, max_ticks=100000, load_factor=1.0):
+    """
+    Simulate one boarding of a cabin layout, given a (rows x seats)
+    boarding-rank array, with the time-stepped aisle/seat model.
+    Returns a dict with the completion time in ticks and minutes and the
+    tick at which each seat was taken (rows x seats, 0 for empty seats).
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+
+    target, seat_col = boarding_sequence(rank, rng, load_factor=load_factor)
+    stow = sample_stow_ticks(rng, target.shape, luggage_rate, stow_ticks)
+    seated_at = run_boarding(layout, target[None], seat_col[None], stow[None],
+                             shuffle_ticks, max_ticks)[0]
+
+    # Tick at which each seat was taken
+    seat_times = np.zeros(rank.shape, dtype=int)
+    seat_times[target, seat_col] = seated_at
+
+    ticks = int(seated_at.max()) if len(seated_at) else 0
+    return {
+        'ticks': ticks,
+        'minutes': ticks * SECONDS_PER_TICK / 60,
+        'seat_times': seat_times,
+    }
+
+def summarize_times(minutes, confidence=0.95, percentiles=(5, 25, 50, 75, 90, 95)):
+    """
+    Summarize a sample of boarding times: mean, standard deviation,
+    percentiles and a normal-approximation confidence interval for the mean.
+    """
+    minutes = np.asarray(minutes, dtype=float)
+    mean = minutes.mean()
+    std = minutes.std(ddof=1) if len(minutes) > 1 else 0.0
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    half_width = z * std / np.sqrt(len(minutes))
+    return {
+        'n': len(minutes),
+        'mean': mean,
+        'std': std,
+        'percentiles': dict(zip(percentiles, np.percentile(minutes, percentiles))),
+        'confidence': confidence,
+        'ci': (mean - half_width, mean + half_width),
+    }
+
+def boarding_batches(layout, rank, n_replicates, seed=None, batch_size=2000,
+                     luggage_rate=0.8, stow_ticks=(6, 20), shuffle_ticks=6, max_ticks=100000,
+                     load_factor=1.0):
+    """
+    Simulate n_replicates boardings of a cabin layout in chunks of
+    batch_size, yielding (start, target, seat_col, seated_at) per chunk:
+    the index of its first replicate and (replicates x passengers) arrays
+    in queue order. Each chunk draws from its own numpy Generator spawned
+    from seed (an int or a SeedSequence), so results are reproducible for
+    a given seed and batch_size.
+    """
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    streams = seed.spawn(-(-n_replicates // batch_size))
+    for start, stream in zip(range(0, n_replicates, batch_size), streams):
+        size = min(batch_size, n_replicates - start)
+        rng = np.random.default_rng(stream)
+        target, seat_col = boarding_sequence(rank, rng, n_replicates=size, load_factor=load_factor)
+        stow = sample_stow_ticks(rng, target.shape, luggage_rate, stow_ticks)
+        seated_at = run_boarding(layout, target, seat_col, stow, shuffle_ticks, max_ticks)
+        yield start, target, seat_col, seated_at
+
+def simulate_boarding_batch(layout, rank, n_replicates, seed=None, batch_size=2000,
+                            luggage_rate=0.8, stow_ticks=(6, 20), shuffle_ticks=6,
+                            confidence=0.95, max_ticks=100000, load_factor=1.0):
+    """
+    Run n_replicates independent boardings of a cabin layout, given a
+    (rows x seats) boarding-rank array such as SeatAssignment.rank, as
+    array computations with a replicate axis on every state array.
+
+    Replicates are processed in chunks of batch_size (see boarding_batches)
+    to bound memory. Returns the completion-time distribution from
+    summarize_times plus the raw completion times in minutes.
+    """
+    ticks = np.empty(n_replicates, dtype=int)
+    batches = boarding_batches(layout, rank, n_replicates, seed, batch_size,
+                               luggage_rate, stow_ticks, shuffle_ticks, max_ticks, load_factor)
+    for start, _, _, seated_at in batches:
+        ticks[start:start + len(seated_at)] = seated_at.max(axis=1, initial=0)
+
+    minutes = ticks * SECONDS_PER_TICK / 60
+    summary = summarize_times(minutes, confidence)
+    summary['minutes'] = minutes
+    return summary
+
+if __name__ == "__main__":
+    import sys
+
+    from models.cabin_layout import LAYOUTS
+    from models.seat_assignments import strategy_assignment
+
+    layout = LAYOUTS[sys.argv[1] if len(sys.argv) > 1 else 'b737']
+    print(f"{layout.name} ({layout.describe()}, {layout.n_seats} seats)")
+
+    strategies = [
+        ('Back-to-Front', 'back_to_front'),
+        ('Outside-In', 'outside_in'),
+        ('Hybrid', 'hybrid'),
+        ('Random', 'random'),
+    ]
+    for name, strategy in strategies:
+        rank = strategy_assignment(strategy, layout).rank
+        result = simulate_boarding_batch(layout, rank, 10000, seed=42)
+        low, high = result['ci']
+        print(f"{name}: {result['mean']:.2f} minutes "
+              f"(95% CI {low:.2f}-{high:.2f}, P90 {result['percentiles'][90]:.2f})")
@@ -0,0 +1,255 @@
+from dataclasses import dataclass
+from functools import cached_property
+import string
+
+import numpy as np
+
+# Seat types used by the outside-in and hybrid strategies
+WINDOW = 0
+MIDDLE = 1
+AISLE = 2
+
+# Seat letters skip I (easily confused with 1), as airlines do
+SEAT_LETTERS = string.ascii_uppercase.replace('I', '')
+
+@dataclass(frozen=True)
+class CabinLayout:
+    """
+    Description of an economy cabin: rows, seat columns, aisles, exit rows
+    and doors. Layouts are immutable and hashable so they can key caches.
+
+    aisles holds, for each aisle, the index of the first column to its
+    right, e.g. (3,) for a 3-3 single aisle or (3, 7) for a 3-4-3 twin
+    aisle. Every derived array is computed once per layout with array
+    operations, so its cost is linear in the number of seats.
+
+    exit_rows and doors are drawn on the seat maps only. The simulators
+    board every layout as one queue through a door in front of the first
+    row, so the mid-cabin doors of the widebody presets are not used.
+    """
+    name: str
+    rows: tuple
+    columns: tuple
+    aisles: tuple
+    exit_rows: tuple = ()
+    doors: tuple = ()
+
+    def __post_init__(self):
+        # Accept any sequences but store tuples so the layout stays hashable
+        for field in ('rows', 'columns', 'aisles', 'exit_rows', 'doors'):
+            object.__setattr__(self, field, tuple(getattr(self, field)))
+        if not self.aisles or list(self.aisles) != sorted(set(self.aisles)):
+            raise ValueError("aisles must be a non-empty increasing sequence")
+        if self.aisles[0] <= 0 or self.aisles[-1] >= len(self.columns):
+            raise ValueError("every aisle must have seats on both sides")
+
+    @property
+    def n_rows(self):
+        return len(self.rows)
+
+    @property
+    def n_cols(self):
+        return len(self.columns)
+
+    @property
+    def n_aisles(self):
+        return len(self.aisles)
+
+    @property
+    def n_seats(self):
+        return self.n_rows * self.n_cols
+
+    @cached_property
+    def row_index(self):
+        """
+        Map from row number to row index (0 at the front).
+        """
+        return {row: i for i, row in enumerate(self.rows)}
+
+    @cached_property
+    def _aisle_distance(self):
+        # Seats between each column and each aisle: (columns x aisles)
+        j = np.arange(self.n_cols)[:, None]
+        boundary = np.array(self.aisles)[None, :]
+        return np.where(j < boundary, boundary - 1 - j, j - boundary)
+
+    @cached_property
+    def seat_aisle(self):
+        """
+        Aisle used to reach each column: the nearest one, the forward-most
+        (lowest index) aisle on ties.
+        """
+        return np.argmin(self._aisle_distance, axis=1)
+
+    @cached_property
+    def aisle_distance(self):
+        """
+        Number of seats between each column and the aisle it is reached from.
+        """
+        return self._aisle_distance[np.arange(self.n_cols), self.seat_aisle]
+
+    @cached_property
+    def seat_side(self):
+        """
+        Side of its aisle each column is on: 0 left, 1 right.
+        """
+        boundary = np.array(self.aisles)[self.seat_aisle]
+        return (np.arange(self.n_cols) >= boundary).astype(int)
+
+    @cached_property
+    def seat_types(self):
+        """
+        Seat type of each column: WINDOW at the cabin wall, AISLE next to
+        an aisle, MIDDLE otherwise.
+        """
+        types = np.where(self.aisle_distance == 0, AISLE, MIDDLE)
+        types[[0, -1]] = WINDOW
+        return types
+
+    @cached_property
+    def blocking_mask(self):
+        """
+        (columns x columns) boolean mask where mask[j, k] is True when a
+        passenger sitting in column k blocks the way from the aisle to column j.
+        """
+        same_side = ((self.seat_aisle[:, None] == self.seat_aisle[None, :])
+                     & (self.seat_side[:, None] == self.seat_side[None, :]))
+        return same_side & (self.aisle_distance[None, :] < self.aisle_distance[:, None])
+
+    @cached_property
+    def seat_bits(self):
+        """
+        Bit of each column in a packed row occupancy: a row's taken seats
+        are the bitwise OR of their seat_bits.
+        """
+        return (1 << np.arange(self.n_cols)).astype(np.uint32)
+
+    @cached_property
+    def blocker_lookup(self):
+        """
+        Number of blocking passengers as a table lookup on packed row
+        occupancy. Returns (shift, table): a passenger bound for column j
+        of a row with occupancy bits waits for
+        table[j, (bits >> shift[j]) & (table.shape[1] - 1)] passengers.
+
+        Only seats on the same side of the same aisle can block, so shift[j]
+        is the first column of j's side and the table spans the widest side
+        (3 seats on a 3-3 or 3-4-3 row) rather than the whole row.
+        """
+        side = self.seat_aisle * 2 + self.seat_side
+        shift = np.array([np.flatnonzero(side == s)[0] for s in side])
+        width = int(np.bincount(side).max())
+
+        # blocks[j, k]: column shift[j] + k blocks column j
+        offsets = shift[:, None] + np.arange(width)
+        inside = offsets < self.n_cols
+        blocks = np.zeros((self.n_cols, width), dtype=int)
+        blocks[inside] = self.blocking_mask[np.nonzero(inside)[0], offsets[inside]]
+
+        bits = (np.arange(1 << width)[:, None] >> np.arange(width)) & 1
+        return shift.astype(np.uint32), (blocks @ bits.T).astype(np.uint8)
+
+    @cached_property
+    def column_x(self):
+        """
+        Horizontal centre of each column in seat-map units, leaving half a
+        seat of space for every aisle.
+        """
+        j = np.arange(self.n_cols)
+        aisles_left = np.searchsorted(np.array(self.aisles), j, side='right')
+        return j + 0.5 + 0.5 * aisles_left
+
+    @cached_property
+    def aisle_x(self):
+        """
+        Horizontal position of each aisle in seat-map units.
+        """
+        return np.array(self.aisles) + 0.5 * np.arange(self.n_aisles) + 0.25
+
+    @property
+    def width(self):
+        """
+        Width of the cabin outline in seat-map units.
+        """
+        return self.n_cols + 0.5 * self.n_aisles + 0.5
+
+    def columns_of_type(self, seat_type):
+        """
+        Column letters of the given seat type.
+        """
+        return [col for col, kind in zip(self.columns, self.seat_types) if kind == seat_type]
+
+    def describe(self):
+        """
+        Short configuration string such as '3-4-3'.
+        """
+        edges = (0,) + self.aisles + (self.n_cols,)
+        return '-'.join(str(b - a) for a, b in zip(edges, edges[1:]))
+
+def synthetic_layout(n_rows, blocks=(3, 3), first_row=1, name=None,
+                     exit_rows=(), doors=None):
+    """
+    Build a layout with n_rows identical rows of seat blocks separated by
+    aisles, e.g. blocks=(3, 4, 3) for a twin-aisle 3-4-3 cabin.
+    """
+    n_cols = sum(blocks)
+    if n_cols > len(SEAT_LETTERS):
+        raise ValueError(f"at most {len(SEAT_LETTERS)} seats per row are supported")
+    aisles = tuple(np.cumsum(blocks)[:-1].tolist())
+    if name is None:
+        name = f"Synthetic {'-'.join(map(str, blocks))} ({n_rows} rows)"
+    if doors is None:
+        doors = (first_row,)
+    return CabinLayout(
+        name=name,
+        rows=tuple(range(first_row, first_row + n_rows)),
+        columns=tuple(SEAT_LETTERS[:n_cols]),
+        aisles=aisles,
+        exit_rows=tuple(exit_rows),
+        doors=tuple(doors),
+    )
+
+# Economy cabin modelled throughout the project (rows 28-48, A-F)
+BOEING_737_800 = CabinLayout(
+    name='Boeing 737-800',
+    rows=tuple(range(28, 49)),
+    columns=tuple('ABCDEF'),
+    aisles=(3,),
+)
+
+# Twin-aisle 3-3-3 economy
+AIRBUS_A350_900 = CabinLayout(
+    name='Airbus A350-900',
+    rows=tuple(range(20, 50)),
+    columns=tuple('ABCDEFGHK'),
+    aisles=(3, 6),
+    exit_rows=(20, 34),
+    doors=(20, 34),
+)
+
+# Twin-aisle 3-4-3 economy
+BOEING_777_300ER = CabinLayout(
+    name='Boeing 777-300ER',
+    rows=tuple(range(31, 60)),
+    columns=tuple('ABCDEFGHJK'),
+    aisles=(3, 7),
+    exit_rows=(31, 45),
+    doors=(31, 45),
+)
+
+# A380 main-deck economy, 3-4-3 (460 seats)
+AIRBUS_A380_MAIN_DECK = CabinLayout(
+    name='Airbus A380 Main Deck',
+    rows=tuple(range(43, 89)),
+    columns=tuple('ABCDEFGHJK'),
+    aisles=(3, 7),
+    exit_rows=(43, 56, 71),
+    doors=(43, 56, 71),
+)
+
+LAYOUTS = {
+    'b737': BOEING_737_800,
+    'a350': AIRBUS_A350_900,
+    'b777': BOEING_777_300ER,
+    'a380': AIRBUS_A380_MAIN_DECK,
+}
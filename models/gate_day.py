@@ -0,0 +1,175 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from models.boarding_simulation import SECONDS_PER_TICK, run_boarding
+from models.cabin_layout import LAYOUTS
+from models.population import generate_population
+from models.seat_assignments import STRATEGIES, strategy_assignment
+from models.seat_statistics import StreamingStats
+
+# Population columns passed to the workers through shared memory
+SHARED_COLUMNS = ('row', 'col', 'stow')
+
+# Arrays attached in this process by _attach: {column: 1-D array}
+_shared = {}
+
+def plan_gate_day(n_flights=200, layouts=('b737', 'a350', 'b777', 'a380'),
+                  layout_weights=None, load_factors=(0.7, 1.0), seed=0):
+    """
+    A departure bank of n_flights flights, each with a layout key drawn
+    from layouts (with layout_weights) and a load factor drawn uniformly
+    from the load_factors range. Returns a list of flight dicts.
+    """
+    rng = np.random.default_rng(seed)
+    keys = rng.choice(layouts, n_flights, p=layout_weights)
+    loads = rng.uniform(load_factors[0], load_factors[1], n_flights).round(2)
+    return [{'flight': i, 'layout': str(key), 'load_factor': float(load)}
+            for i, (key, load) in enumerate(zip(keys, loads))]
+
+def _share(arrays):
+    """
+    Copy each array into a new shared-memory block. Returns the blocks
+    and {name: (block name, length, dtype)} descriptors for _attach.
+    """
+    blocks = {}
+    descriptors = {}
+    for name, array in arrays.items():
+        block = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+        np.ndarray(array.shape, array.dtype, buffer=block.buf)[:] = array
+        blocks[name] = block
+        descriptors[name] = (block.name, len(array), array.dtype.str)
+    return blocks, descriptors
+
+def _attach(descriptors):
+    """
+    Worker initializer: map the shared population columns read-only.
+    """
+    for name, (block_name, length, dtype) in descriptors.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        array = np.ndarray(length, dtype, buffer=block.buf)
+        array.flags.writeable = False
+        _shared[name] = array
+        # Keep the mapping alive as long as the array
+        _shared[f"_{name}_block"] = block
+
+def _run_task(task):
+    """
+    Board one flight under one strategy from the shared population
+    columns. task is (index, layout key, offset, replicates, passengers);
+    returns the index and the completion tick of every replicate.
+    """
+    index, layout, offset, n_replicates, n_passengers = task
+    end = offset + n_replicates * n_passengers
+    columns = [_shared[name][offset:end].reshape(n_replicates, n_passengers)
+               for name in SHARED_COLUMNS]
+    seated_at = run_boarding(LAYOUTS[layout], *columns)
+    return index, seated_at.max(axis=1, initial=0)
+
+def run_gate_day(flights, strategies=tuple(STRATEGIES), n_replicates=20, seed=0,
+                 parallel=True, max_workers=None, on_result=None, **population):
+    """
+    Board every flight of a plan_gate_day bank under every strategy,
+    n_replicates times each, spread over a process pool.
+
+    The passengers of a flight are drawn once from SeedSequence(seed,
+    spawn_key=(flight,)) and reused for every strategy (common random
+    numbers); population holds generate_population settings other than
+    load_factor. All populations are written to shared memory before the
+    pool starts and the workers map them, so tasks only carry offsets.
+    Results are folded into per-strategy accumulators as they arrive;
+    on_result(flight, strategy, ticks) is called for each as well.
+
+    Returns the mean boarding time in minutes per flight and strategy
+    (flights x strategies), a summary per strategy (mean, std, P90 in
+    minutes, boardings, flights won) and the mean per layout and strategy.
+    """
+    # Draw every population and pack the columns end to end
+    tasks = []
+    parts = {name: [] for name in SHARED_COLUMNS}
+    offset = 0
+    for flight in flights:
+        layout = LAYOUTS[flight['layout']]
+        stream = np.random.SeedSequence(seed, spawn_key=(flight['flight'],))
+        for strategy in strategies:
+            rank = strategy_assignment(strategy, layout).rank
+            passengers = generate_population(np.random.default_rng(stream), layout, rank,
+                                             n_replicates, load_factor=flight['load_factor'],
+                                             **population)
+            for name in SHARED_COLUMNS:
+                parts[name].append(passengers[name].ravel())
+            n_passengers = passengers['row'].shape[1]
+            tasks.append((len(tasks), flight['layout'], offset, n_replicates, n_passengers))
+            offset += n_replicates * n_passengers
+
+    blocks, descriptors = _share({name: np.concatenate(values) for name, values in parts.items()})
+    del parts
+
+    n_strategies = len(strategies)
+    minutes = np.zeros((len(flights), n_strategies))
+    overall = {strategy: StreamingStats((), 1, 7200) for strategy in strategies}
+    by_layout = {}
+    pool = None
+    try:
+        if parallel:
+            pool = ProcessPoolExecutor(max_workers=max_workers, initializer=_attach,
+                                       initargs=(descriptors,))
+            # Folded in completion order, so a slow task does not hold back the rest
+            results = (future.result() for future in
+                       as_completed([pool.submit(_run_task, task) for task in tasks]))
+        else:
+            _attach(descriptors)
+            results = map(_run_task, tasks)
+
+        # Aggregate results as they stream back
+        for index, ticks in results:
+            flight = flights[index // n_strategies]
+            strategy = strategies[index % n_strategies]
+            minutes[index // n_strategies, index % n_strategies] = (
+                ticks.mean() * SECONDS_PER_TICK / 60)
+            overall[strategy].update(ticks[:, None])
+            by_layout.setdefault((flight['layout'], strategy), []).append(ticks.mean())
+            if on_result is not None:
+                on_result(flight, strategy, ticks)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        _shared.clear()
+        for block in blocks.values():
+            block.close()
+            block.unlink()
+
+    wins = np.bincount(minutes.argmin(axis=1), minlength=n_strategies)
+    summary = {}
+    for i, (strategy, stats) in enumerate(overall.items()):
+        summary[strategy] = {
+            'mean': float(stats.mean) * SECONDS_PER_TICK / 60,
+            'std': float(stats.std) * SECONDS_PER_TICK / 60,
+            'p90': float(stats.percentile(90)) * SECONDS_PER_TICK / 60,
+            'boardings': int(stats.count[0]),
+            'flights_won': int(wins[i]),
+        }
+    return {
+        'minutes': minutes,
+        'summary': summary,
+        'by_layout': {key: float(np.mean(values)) * SECONDS_PER_TICK / 60
+                      for key, values in sorted(by_layout.items())},
+    }
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    n_flights = int(sys.argv[1]) if len(sys.argv) > 1 else 120
+    flights = plan_gate_day(n_flights, seed=2024)
+
+    start = time.perf_counter()
+    result = run_gate_day(flights, seed=2024, parallel='--serial' not in sys.argv)
+    seconds = time.perf_counter() - start
+    n_boardings = sum(s['boardings'] for s in result['summary'].values())
+    print(f"{n_flights} flights, {n_boardings} boardings in {seconds:.1f} s "
+          f"({n_boardings / seconds:.0f} boardings/s)")
+    for strategy, summary in result['summary'].items():
+        print(f"{strategy}: {summary['mean']:.2f} minutes (P90 {summary['p90']:.2f}), "
+              f"fastest on {summary['flights_won']} flights")
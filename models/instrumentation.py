@@ -0,0 +1,93 @@
+import numpy as np
+
+from models.boarding_simulation import (
+    PHASES, boarding_sequence, run_boarding, sample_stow_ticks)
+
+def new_instruments(layout, n_replicates, n_passengers, horizon=3600, profile=False):
+    """
+    Preallocated counters for run_boarding(..., instruments=...):
+
+    blocked_ticks  (replicates x rows) walker-ticks spent held up behind
+                   someone standing in the aisle at that row
+    blocked_cells  (replicates x aisles x rows) the same per aisle cell
+    shuffles       (replicates x passengers) seated passengers who had to
+                   get up for each passenger, in queue order
+    door_queue     (replicates x horizon) passengers still waiting at the
+                   door at each tick; ticks past horizon are not recorded
+    phase_seconds  wall time per phase of the tick loop (profile=True)
+    """
+    return {
+        'blocked_ticks': np.zeros((n_replicates, layout.n_rows), dtype=np.int64),
+        'blocked_cells': np.zeros((n_replicates, layout.n_aisles, layout.n_rows), dtype=np.int64),
+        'shuffles': np.zeros((n_replicates, n_passengers), dtype=np.int16),
+        'door_queue': np.zeros((n_replicates, horizon), dtype=np.int32),
+        'phase_seconds': dict.fromkeys(PHASES, 0.0) if profile else None,
+    }
+
+def simulate_instrumented(layout, rank, n_replicates=1000, seed=None, horizon=3600,
+                          profile=False, luggage_rate=0.8, stow_ticks=(6, 20),
+                          shuffle_ticks=6, load_factor=1.0):
+    """
+    Run one batch of boardings with the counters switched on. Returns the
+    filled instruments plus 'ticks', the completion tick of each replicate,
+    and the queue ('target', 'seat_col') and 'seated_at' arrays. seed may
+    be an int or a SeedSequence; the random draws are the same as for a
+    boarding_batches chunk from that SeedSequence.
+    """
+    rng = np.random.default_rng(seed)
+    target, seat_col = boarding_sequence(rank, rng, n_replicates, load_factor)
+    stow = sample_stow_ticks(rng, target.shape, luggage_rate, stow_ticks)
+    instruments = new_instruments(layout, n_replicates, target.shape[1], horizon, profile)
+    seated_at = run_boarding(layout, target, seat_col, stow, shuffle_ticks,
+                             instruments=instruments)
+    instruments['ticks'] = seated_at.max(axis=1, initial=0)
+    instruments.update(target=target, seat_col=seat_col, seated_at=seated_at)
+    return instruments
+
+def record_instruments(store, instruments, **tags):
+    """
+    Append filled instruments to a ResultsStore, one table per counter
+    in long format: 'row_blocking' (replicate, row, blocked_ticks),
+    'shuffles' (replicate, position, shuffles), 'door_queue' (replicate,
+    tick, waiting) and 'phases' (phase, seconds) when profiled.
+    """
+    n_replicates, n_rows = instruments['blocked_ticks'].shape
+    replicate = np.arange(n_replicates, dtype=np.int32)
+
+    def long_format(table, values, index_name, value_name):
+        store.append(table, {
+            'replicate': np.repeat(replicate, values.shape[1]),
+            index_name: np.tile(np.arange(values.shape[1], dtype=np.int32), n_replicates),
+            value_name: values.ravel(),
+        }, **tags)
+
+    long_format('row_blocking', instruments['blocked_ticks'], 'row', 'blocked_ticks')
+    long_format('shuffles', instruments['shuffles'], 'position', 'shuffles')
+    long_format('door_queue', instruments['door_queue'], 'tick', 'waiting')
+    if instruments['phase_seconds'] is not None:
+        phases = instruments['phase_seconds']
+        store.append('phases', {'phase': np.array(list(phases)),
+                                'seconds': np.array(list(phases.values()))}, **tags)
+
+if __name__ == "__main__":
+    import sys
+
+    from models.boarding_simulation import SECONDS_PER_TICK
+    from models.cabin_layout import LAYOUTS
+    from models.seat_assignments import STRATEGIES, strategy_assignment
+
+    layout = LAYOUTS[sys.argv[1] if len(sys.argv) > 1 else 'b737']
+    for strategy in STRATEGIES:
+        rank = strategy_assignment(strategy, layout).rank
+        stats = simulate_instrumented(layout, rank, 1000, seed=42, profile=True)
+        blocked = stats['blocked_ticks'].mean(axis=0)
+        worst = np.argsort(blocked)[::-1][:3]
+        half_boarded = (stats['door_queue'] > stats['door_queue'][:, :1] / 2).sum(axis=1)
+        phases = stats['phase_seconds']
+        total = sum(phases.values())
+        print(f"{strategy}: {stats['ticks'].mean() * SECONDS_PER_TICK / 60:.2f} minutes, "
+              f"{stats['shuffles'].sum(axis=1).mean():.1f} shuffles, "
+              f"{blocked.sum():.0f} blocked walker-ticks "
+              f"(most at rows {', '.join(str(layout.rows[i]) for i in worst)}), "
+              f"half the queue through the door after {half_boarded.mean():.0f} ticks")
+        print("    " + ", ".join(f"{phase} {seconds / total:.0%}" for phase, seconds in phases.items()))
@@ -0,0 +1,144 @@
+import numpy as np
+
+# Columns of a population batch and their dtypes
+POPULATION_COLUMNS = {
+    'row': np.int16,
+    'col': np.int16,
+    'carry_ons': np.int8,
+    'stow': np.int32,
+    'walk_ticks': np.int8,
+    'family': np.int32,
+    'late': bool,
+}
+
+def _families(rng, layout, rank, n_flights, family_rate, family_size_probs):
+    """
+    Family id of every seat, (flights x rows x seats), -1 for passengers
+    travelling alone, and the boarding rank each family boards with (the
+    earliest group among its seats). A family sits in adjacent seats of
+    one seat block of a row.
+    """
+    family = np.full((n_flights, layout.n_rows, layout.n_cols), -1, dtype=np.int32)
+    family_rank = np.broadcast_to(rank, family.shape).copy()
+    sizes = np.arange(2, 2 + len(family_size_probs))
+    edges = (0,) + layout.aisles + (layout.n_cols,)
+    for block, (left, right) in enumerate(zip(edges, edges[1:])):
+        width = right - left
+        shape = (n_flights, layout.n_rows)
+        size = np.minimum(rng.choice(sizes, shape, p=family_size_probs), width)
+        start = (rng.random(shape) * (width - size + 1)).astype(int)
+        offset = np.arange(width) - start[..., None]
+        members = ((offset >= 0) & (offset < size[..., None])
+                   & (rng.random(shape) < family_rate)[..., None])
+
+        # One id per row and block within a flight, below n_seats
+        ids = np.arange(layout.n_rows)[:, None] * (layout.n_aisles + 1) + block
+        family[..., left:right] = np.where(members, ids, -1)
+        first = np.where(members, rank[:, left:right], np.iinfo(np.int16).max).min(axis=-1)
+        family_rank[..., left:right] = np.where(members, first[..., None], rank[:, left:right])
+    return family, family_rank
+
+def generate_population(rng, layout, rank, n_flights, load_factor=1.0,
+                        carry_on_probs=(0.2, 0.6, 0.2), stow_ticks=(6, 20),
+                        walk_ticks_probs=(0.85, 0.15), family_rate=0.15,
+                        family_size_probs=(0.6, 0.25, 0.15), late_rate=0.03):
+    """
+    Sample the passengers of n_flights boardings at once, given a
+    (rows x seats) boarding-rank array. Returns the POPULATION_COLUMNS as
+    (flights x passengers) arrays in queue order, the same layout as
+    boarding_sequence, so row, col and stow can go straight to
+    run_boarding.
+
+    load_factor of the seats are taken, at random. Each passenger has
+    0, 1, 2, ... carry-ons with probabilities carry_on_probs, taking a
+    uniform stow_ticks each (1 tick without bags), and walks one row
+    every 1, 2, ... ticks with probabilities walk_ticks_probs. A seat
+    block of a row holds a family with probability family_rate, of 2, 3,
+    4, ... members (family_size_probs). Families sit together, board
+    together with the earliest group among their seats and share one
+    late_rate draw; late passengers board after every group, in random
+    order. The aisle simulators walk everyone one row per tick, so they
+    do not use walk_ticks.
+    """
+    n_seats = layout.n_seats
+    shape = (n_flights, n_seats)
+    seat_rows, seat_cols = np.indices(rank.shape).reshape(2, -1)
+    family, family_rank = _families(rng, layout, rank, n_flights, family_rate, family_size_probs)
+    family = family.reshape(shape)
+    family_rank = family_rank.reshape(shape)
+
+    # Lateness and in-group order are drawn per family, so members stay together
+    unit = np.where(family >= 0, n_seats + family, np.arange(n_seats))
+    late = np.take_along_axis(rng.random((n_flights, 2 * n_seats)) < late_rate, unit, axis=1)
+    ties = np.take_along_axis(rng.random((n_flights, 2 * n_seats)), unit, axis=1)
+    key = np.where(late, int(rank.max()) + 1, family_rank) + ties
+
+    # Empty seats sort last and are dropped
+    n_passengers = round(load_factor * n_seats)
+    if n_passengers < n_seats:
+        empty = np.argsort(rng.random(shape), axis=1)[:, n_passengers:]
+        np.put_along_axis(key, empty, np.inf, axis=1)
+    order = np.argsort(key, axis=1)[:, :n_passengers]
+
+    # Luggage and walking pace per passenger, in queue order
+    passengers = (n_flights, n_passengers)
+    carry_ons = rng.choice(len(carry_on_probs), passengers, p=carry_on_probs)
+    max_bags = len(carry_on_probs) - 1
+    bag_ticks = rng.integers(stow_ticks[0], stow_ticks[1] + 1, passengers + (max_bags,))
+    bags = np.arange(1, max_bags + 1) <= carry_ons[..., None]
+    stow = np.where(carry_ons > 0, (bag_ticks * bags).sum(axis=-1), 1)
+    walk_ticks = 1 + rng.choice(len(walk_ticks_probs), passengers, p=walk_ticks_probs)
+
+    columns = {
+        'row': seat_rows[order],
+        'col': seat_cols[order],
+        'carry_ons': carry_ons,
+        'stow': stow,
+        'walk_ticks': walk_ticks,
+        'family': np.take_along_axis(family, order, axis=1),
+        'late': np.take_along_axis(late, order, axis=1),
+    }
+    return {name: values.astype(POPULATION_COLUMNS[name]) for name, values in columns.items()}
+
+def population_batches(layout, rank, n_flights, seed=None, batch_size=2000, **population):
+    """
+    Generate the passengers of n_flights boardings in chunks of
+    batch_size flights, yielding (start, columns) per chunk so that large
+    sweeps never hold every passenger at once. Each chunk draws from its
+    own Generator spawned from seed (an int or a SeedSequence).
+    population holds the distribution settings of generate_population.
+    """
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    streams = seed.spawn(-(-n_flights // batch_size))
+    for start, stream in zip(range(0, n_flights, batch_size), streams):
+        size = min(batch_size, n_flights - start)
+        yield start, generate_population(np.random.default_rng(stream), layout, rank, size,
+                                         **population)
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    from models.boarding_simulation import SECONDS_PER_TICK, run_boarding
+    from models.cabin_layout import LAYOUTS
+    from models.seat_assignments import STRATEGIES, strategy_assignment
+
+    layout = LAYOUTS[sys.argv[1] if len(sys.argv) > 1 else 'b737']
+    n_flights = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+
+    for strategy in STRATEGIES:
+        rank = strategy_assignment(strategy, layout).rank
+        generating = 0.0
+        ticks = []
+        start = time.perf_counter()
+        for _, passengers in population_batches(layout, rank, n_flights, seed=42,
+                                                load_factor=0.9):
+            generating += time.perf_counter() - start
+            seated_at = run_boarding(layout, passengers['row'], passengers['col'],
+                                     passengers['stow'])
+            ticks.append(seated_at.max(axis=1, initial=0))
+            start = time.perf_counter()
+        minutes = np.concatenate(ticks) * SECONDS_PER_TICK / 60
+        print(f"{strategy}: {minutes.mean():.2f} minutes, population generated at "
+              f"{n_flights * passengers['row'].shape[1] / generating / 1e6:.1f} M passengers/s")
@@ -0,0 +1,183 @@
+import json
+import os
+from pathlib import Path
+from statistics import NormalDist
+import uuid
+
+import numpy as np
+
+from models.boarding_simulation import SECONDS_PER_TICK, boarding_batches
+from models.cabin_layout import LAYOUTS
+from models.seat_assignments import strategy_assignment
+
+class ResultsStore:
+    """
+    Append-only columnar store for simulation results under a directory.
+
+    Each table (e.g. 'runs', 'passengers') is a list of chunks, one per
+    append: a folder with one .npy file per column and a manifest.json
+    holding the row count and the chunk's tags (scalar metadata such as
+    strategy, layout, load_factor and seed). Columns are opened
+    memory-mapped and tag filters are resolved from the manifests alone,
+    so queries only touch the chunks and columns they need.
+    """
+    def __init__(self, path):
+        self.path = Path(path)
+
+    def append(self, table, columns, **tags):
+        """
+        Write a chunk of equal-length columns (name -> array) with its tags.
+        The chunk is written to a temporary folder and renamed into place,
+        so readers never see a partial chunk.
+        """
+        columns = {name: np.asarray(values) for name, values in columns.items()}
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) != 1:
+            raise ValueError("all columns of a chunk must have the same length")
+
+        directory = self.path / table
+        directory.mkdir(parents=True, exist_ok=True)
+        staging = directory / f".tmp-{uuid.uuid4().hex}"
+        staging.mkdir()
+        for name, values in columns.items():
+            np.save(staging / f"{name}.npy", values)
+        with open(staging / 'manifest.json', 'w') as f:
+            json.dump({'rows': lengths.pop(), 'columns': list(columns), 'tags': tags}, f)
+
+        # Chunk names sort in the order they were written
+        existing = len(self._chunk_dirs(table))
+        os.rename(staging, directory / f"{existing:08d}-{staging.name[5:13]}")
+
+    def _chunk_dirs(self, table):
+        directory = self.path / table
+        if not directory.is_dir():
+            return []
+        return sorted(d for d in directory.iterdir() if d.is_dir() and not d.name.startswith('.'))
+
+    def chunks(self, table, **filters):
+        """
+        Manifests of the chunks of a table whose tags match the filters.
+        A filter value may be a single value or a list/tuple/set of values.
+        """
+        matching = []
+        for directory in self._chunk_dirs(table):
+            with open(directory / 'manifest.json') as f:
+                manifest = json.load(f)
+            if _tags_match(manifest['tags'], filters):
+                manifest['path'] = directory
+                matching.append(manifest)
+        return matching
+
+    def scan(self, table, columns=None, **filters):
+        """
+        Yield (tags, {column: memory-mapped array}) for every matching
+        chunk, reading only the requested columns (all by default).
+        """
+        for manifest in self.chunks(table, **filters):
+            names = manifest['columns'] if columns is None else columns
+            yield manifest['tags'], {name: np.load(manifest['path'] / f"{name}.npy", mmap_mode='r')
+                                     for name in names}
+
+    def read(self, table, columns=None, **filters):
+        """
+        Concatenate the matching chunks into in-memory arrays. Tag names
+        can be requested as columns and are repeated for every row.
+        """
+        parts = {}
+        for manifest in self.chunks(table, **filters):
+            names = manifest['columns'] if columns is None else columns
+            for name in names:
+                if name in manifest['tags']:
+                    values = np.full(manifest['rows'], manifest['tags'][name])
+                else:
+                    values = np.load(manifest['path'] / f"{name}.npy", mmap_mode='r')
+                parts.setdefault(name, []).append(values)
+        return {name: np.concatenate(values) for name, values in parts.items()}
+
+def _tags_match(tags, filters):
+    for name, wanted in filters.items():
+        if wanted is None:
+            continue
+        if not isinstance(wanted, (list, tuple, set)):
+            wanted = [wanted]
+        if tags.get(name) not in wanted:
+            return False
+    return True
+
+def record_boardings(store, layout, strategy, n_replicates, seed=0, batch_size=2000,
+                     load_factor=1.0, passengers=False, **sim_params):
+    """
+    Simulate n_replicates boardings of a strategy on a layout (a LAYOUTS
+    key) and append them to the store chunk by chunk: one 'runs' row per
+    boarding (replicate, ticks) and, with passengers=True, one
+    'passengers' row per passenger (replicate, queue position, row and
+    column index, seated_at tick). Chunks are tagged with strategy,
+    layout, load_factor and seed.
+    """
+    rank = strategy_assignment(strategy, LAYOUTS[layout]).rank
+    tags = dict(strategy=strategy, layout=layout, load_factor=load_factor, seed=seed)
+    batches = boarding_batches(LAYOUTS[layout], rank, n_replicates, seed, batch_size,
+                               load_factor=load_factor, **sim_params)
+    for start, target, seat_col, seated_at in batches:
+        size, n = seated_at.shape
+        replicate = np.arange(start, start + size, dtype=np.int32)
+        store.append('runs', {'replicate': replicate,
+                              'ticks': seated_at.max(axis=1, initial=0).astype(np.int32)}, **tags)
+        if passengers:
+            store.append('passengers', {
+                'replicate': np.repeat(replicate, n),
+                'position': np.tile(np.arange(n, dtype=np.int32), size),
+                'row': target.ravel().astype(np.int16),
+                'col': seat_col.ravel().astype(np.int16),
+                'seated_at': seated_at.ravel().astype(np.int32),
+            }, **tags)
+
+def _percentile(cumulative, q):
+    """
+    Percentile q of integer samples given as cumulative counts per value,
+    interpolated like numpy.percentile.
+    """
+    position = q / 100 * (cumulative[-1] - 1)
+    low = np.searchsorted(cumulative, np.floor(position), side='right')
+    high = np.searchsorted(cumulative, np.ceil(position), side='right')
+    return low + (high - low) * (position - np.floor(position))
+
+def summarize_runs(store, by='strategy', confidence=0.95,
+                   percentiles=(5, 25, 50, 75, 90, 95), **filters):
+    """
+    Boarding-time distribution per value of a tag (or tuple of tags) over
+    the matching 'runs' chunks, in minutes, with the same fields as
+    boarding_simulation.summarize_times. Chunks are folded one at a time
+    into a histogram of integer ticks, so memory does not depend on the
+    number of runs.
+    """
+    keys = (by,) if isinstance(by, str) else tuple(by)
+    histograms = {}
+    for tags, columns in store.scan('runs', ['ticks'], **filters):
+        key = tags[keys[0]] if len(keys) == 1 else tuple(tags[k] for k in keys)
+        counts = np.bincount(columns['ticks'])
+        total = histograms.get(key, np.zeros(0, dtype=np.int64))
+        if len(total) < len(counts):
+            total = np.pad(total, (0, len(counts) - len(total)))
+        total[:len(counts)] += counts
+        histograms[key] = total
+
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    summaries = {}
+    for key, counts in histograms.items():
+        minutes = np.arange(len(counts)) * SECONDS_PER_TICK / 60
+        n = int(counts.sum())
+        mean = (counts * minutes).sum() / n
+        std = np.sqrt((counts * (minutes - mean) ** 2).sum() / (n - 1)) if n > 1 else 0.0
+        cumulative = np.cumsum(counts)
+        half_width = z * std / np.sqrt(n)
+        summaries[key] = {
+            'n': n,
+            'mean': mean,
+            'std': std,
+            'percentiles': {q: _percentile(cumulative, q) * SECONDS_PER_TICK / 60
+                            for q in percentiles},
+            'confidence': confidence,
+            'ci': (mean - half_width, mean + half_width),
+        }
+    return summaries
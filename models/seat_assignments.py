@@ -0,0 +1,110 @@
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+from models.cabin_layout import BOEING_737_800
+
+CACHE_SIZE = 128
+
+# groups: (rows x seats) boarding group label per seat, as shown on the charts
+# group_order: group labels in the order they are called to board
+# rank: (rows x seats) position of each seat's group in group_order (0 boards first)
+SeatAssignment = namedtuple('SeatAssignment', ['groups', 'group_order', 'rank'])
+
+def _assignment(groups, group_order):
+    """
+    Pack a group array and its boarding order into a read-only SeatAssignment.
+    """
+    groups = groups.astype(np.int16)
+    group_order = tuple(int(group) for group in group_order)
+    lookup = np.zeros(max(group_order) + 1, dtype=np.int16)
+    lookup[list(group_order)] = np.arange(len(group_order))
+    rank = lookup[groups]
+
+    # Cached results are shared between callers
+    groups.setflags(write=False)
+    rank.setflags(write=False)
+    return SeatAssignment(groups, group_order, rank)
+
+def _sections(n_rows, n_sections):
+    """
+    Split rows front to back into n_sections equal blocks, the last one
+    taking any extra rows. Returns the section index of each row.
+    """
+    size = max(1, n_rows // n_sections)
+    return np.minimum(np.arange(n_rows) // size, n_sections - 1)
+
+@lru_cache(maxsize=CACHE_SIZE)
+def back_to_front_assignment(layout=BOEING_737_800, n_zones=6):
+    """
+    Back-to-front: rows are split into n_zones zones, Group 1 at the front.
+    Zones board from the back, i.e. n_zones, ..., 2, 1.
+    """
+    zones = _sections(layout.n_rows, n_zones)
+    groups = np.repeat(zones[:, None] + 1, layout.n_cols, axis=1)
+    return _assignment(groups, range(n_zones, 0, -1))
+
+@lru_cache(maxsize=CACHE_SIZE)
+def outside_in_assignment(layout=BOEING_737_800):
+    """
+    Outside-in: Group 1 window, Group 2 middle, Group 3 aisle seats.
+    """
+    groups = np.tile(layout.seat_types + 1, (layout.n_rows, 1))
+    return _assignment(groups, range(1, 4))
+
+@lru_cache(maxsize=CACHE_SIZE)
+def hybrid_assignment(layout=BOEING_737_800, n_sections=3):
+    """
+    Hybrid: window, then middle, then aisle seats, each split into
+    n_sections sections boarding back to front (Groups 1-9 for 3 sections).
+    """
+    sections = _sections(layout.n_rows, n_sections)
+    groups = (layout.seat_types[None, :] * n_sections
+              + (n_sections - 1 - sections)[:, None] + 1)
+    return _assignment(groups, range(1, 3 * n_sections + 1))
+
+@lru_cache(maxsize=CACHE_SIZE)
+def random_assignment(layout=BOEING_737_800):
+    """
+    Random: every seat in a single group; the order within it is random.
+    """
+    return _assignment(np.ones((layout.n_rows, layout.n_cols)), [1])
+
+STRATEGIES = {
+    'back_to_front': back_to_front_assignment,
+    'outside_in': outside_in_assignment,
+    'hybrid': hybrid_assignment,
+    'random': random_assignment,
+}
+
+def strategy_assignment(strategy, layout=BOEING_737_800, **params):
+    """
+    Look up the cached seat assignment of a strategy by name.
+    """
+    return STRATEGIES[strategy](layout, **params)
+
+def custom_assignment(groups, group_order=None):
+    """
+    Wrap any (rows x seats) group array, e.g. one found by the optimizer,
+    as a SeatAssignment. Groups board in increasing label order unless
+    group_order is given.
+    """
+    groups = np.asarray(groups)
+    if group_order is None:
+        group_order = np.unique(groups)
+    return _assignment(groups, group_order)
+
+def seat_group_map(assignment, layout=BOEING_737_800):
+    """
+    Expand an assignment into a {(row, col): group} dict.
+    """
+    return {(row, col): int(assignment.groups[i, j])
+            for i, row in enumerate(layout.rows) for j, col in enumerate(layout.columns)}
+
+def clear_cache():
+    """
+    Drop all memoized assignments.
+    """
+    for build in STRATEGIES.values():
+        build.cache_clear()
@@ -0,0 +1,134 @@
+import numpy as np
+
+from models.instrumentation import simulate_instrumented
+
+class StreamingStats:
+    """
+    Running count, mean and variance plus a fixed-bin histogram for every
+    cell of an array (e.g. every seat), updated one batch at a time.
+
+    Memory depends only on the shape and the number of bins, not on how
+    many samples went in. Values at or above n_bins * bin_width fall into
+    the last bin, so percentiles are exact to one bin width below that.
+    """
+    def __init__(self, shape, bin_width=1.0, n_bins=3600):
+        self.shape = tuple(shape)
+        self.bin_width = bin_width
+        self.n_bins = n_bins
+        n_cells = int(np.prod(self.shape))
+        self.count = np.zeros(n_cells, dtype=np.int64)
+        self._mean = np.zeros(n_cells)
+        self._m2 = np.zeros(n_cells)
+        self.histogram = np.zeros((n_cells, n_bins), dtype=np.int64)
+
+    def _combine(self, count, mean, m2, histogram):
+        # Chan et al.'s pairwise update of the moments
+        total = self.count + count
+        weight = np.divide(count, total, out=np.zeros(len(total)), where=total > 0)
+        delta = mean - self._mean
+        self._mean += delta * weight
+        self._m2 += m2 + delta ** 2 * self.count * weight
+        self.count = total
+        self.histogram += histogram
+
+    def update(self, values, mask=None):
+        """
+        Add a batch of samples, a (batch x shape) array; with a mask of the
+        same shape only the True entries count (e.g. occupied seats).
+        """
+        values = np.asarray(values, dtype=float).reshape(len(values), -1)
+        mask = np.ones(values.shape, dtype=bool) if mask is None else np.reshape(mask, values.shape)
+        count = mask.sum(axis=0)
+        mean = np.divide(np.where(mask, values, 0).sum(axis=0), count,
+                         out=np.zeros(values.shape[1]), where=count > 0)
+        m2 = np.where(mask, (values - mean) ** 2, 0).sum(axis=0)
+
+        bins = np.clip((values // self.bin_width).astype(np.int64), 0, self.n_bins - 1)
+        cells = np.broadcast_to(np.arange(values.shape[1]) * self.n_bins, values.shape)
+        histogram = np.bincount((cells + bins)[mask], minlength=self.histogram.size)
+        self._combine(count, mean, m2, histogram.reshape(self.histogram.shape))
+
+    def merge(self, other):
+        """
+        Fold in another accumulator of the same shape and bins.
+        """
+        if (other.shape, other.bin_width, other.n_bins) != (self.shape, self.bin_width, self.n_bins):
+            raise ValueError("can only merge accumulators with the same shape and bins")
+        self._combine(other.count, other._mean, other._m2, other.histogram)
+
+    @property
+    def mean(self):
+        """
+        Mean per cell, NaN where there are no samples.
+        """
+        return np.where(self.count > 0, self._mean, np.nan).reshape(self.shape)
+
+    @property
+    def std(self):
+        """
+        Sample standard deviation per cell, NaN with fewer than two samples.
+        """
+        variance = np.divide(self._m2, self.count - 1, out=np.full(len(self.count), np.nan),
+                             where=self.count > 1)
+        return np.sqrt(variance).reshape(self.shape)
+
+    def percentile(self, q):
+        """
+        Percentile q per cell from the histogram, interpolated linearly
+        within the bin it falls in. NaN where there are no samples.
+        """
+        cumulative = np.cumsum(self.histogram, axis=1)
+        wanted = q / 100 * self.count
+        # First bin whose cumulative count reaches the wanted rank
+        index = np.minimum((cumulative < wanted[:, None]).sum(axis=1), self.n_bins - 1)
+        cells = np.arange(len(self.count))
+        below = cumulative[cells, index] - self.histogram[cells, index]
+        fraction = np.divide(wanted - below, self.histogram[cells, index],
+                             out=np.zeros(len(self.count)), where=self.histogram[cells, index] > 0)
+        values = (index + fraction) * self.bin_width
+        return np.where(self.count > 0, values, np.nan).reshape(self.shape)
+
+def aggregate_boardings(layout, rank, n_replicates, seed=None, batch_size=2000, bin_ticks=5,
+                        max_ticks=7200, luggage_rate=0.8, stow_ticks=(6, 20),
+                        shuffle_ticks=6, load_factor=1.0):
+    """
+    Simulate n_replicates boardings in batches and fold each batch into
+    streaming accumulators, in ticks:
+
+    seat_times  (rows x seats) tick at which each seat's passenger sat
+                down, over the boardings in which it was taken
+    congestion  (aisles x rows) walker-ticks spent waiting to step into
+                each aisle cell, per boarding
+    ticks       completion tick of each boarding
+
+    Batches draw from the same SeedSequence children as boarding_batches,
+    so results match it for a given seed and batch_size. Memory depends
+    on batch_size and the histogram bins only.
+    """
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    n_bins = -(-max_ticks // bin_ticks)
+    stats = {
+        'seat_times': StreamingStats((layout.n_rows, layout.n_cols), bin_ticks, n_bins),
+        'congestion': StreamingStats((layout.n_aisles, layout.n_rows), bin_ticks, n_bins),
+        'ticks': StreamingStats((), bin_ticks, n_bins),
+    }
+
+    streams = seed.spawn(-(-n_replicates // batch_size))
+    for start, stream in zip(range(0, n_replicates, batch_size), streams):
+        size = min(batch_size, n_replicates - start)
+        batch = simulate_instrumented(layout, rank, size, stream, horizon=0,
+                                      luggage_rate=luggage_rate, stow_ticks=stow_ticks,
+                                      shuffle_ticks=shuffle_ticks, load_factor=load_factor)
+
+        # Scatter the queue back onto the seat grid; empty seats stay masked
+        seat_times = np.zeros((size, layout.n_rows, layout.n_cols))
+        taken = np.zeros(seat_times.shape, dtype=bool)
+        replicate = np.arange(size)[:, None]
+        seat_times[replicate, batch['target'], batch['seat_col']] = batch['seated_at']
+        taken[replicate, batch['target'], batch['seat_col']] = True
+
+        stats['seat_times'].update(seat_times, taken)
+        stats['congestion'].update(batch['blocked_cells'])
+        stats['ticks'].update(batch['ticks'][:, None])
+    return stats
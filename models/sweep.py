@@ -0,0 +1,134 @@
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+from models.boarding_simulation import boarding_batches
+from models.cabin_layout import LAYOUTS
+from models.results_store import ResultsStore
+from models.seat_assignments import STRATEGIES, strategy_assignment
+
+def plan_sweep(layouts=('b737',), strategies=tuple(STRATEGIES), load_factors=(1.0,),
+               luggage_rates=(0.8,), n_replicates=1000, unit_size=500):
+    """
+    Split a sweep over layouts x strategies x load factors x luggage rates
+    into work units of at most unit_size replicates each. Returns a list
+    of unit dicts in a fixed order; a unit's position in it determines
+    its random stream.
+    """
+    units = []
+    for layout in layouts:
+        for strategy in strategies:
+            for load_factor in load_factors:
+                for luggage_rate in luggage_rates:
+                    for start in range(0, n_replicates, unit_size):
+                        units.append({
+                            'id': f"{layout}/{strategy}/lf{load_factor}/lug{luggage_rate}/{start}",
+                            'layout': layout,
+                            'strategy': strategy,
+                            'load_factor': load_factor,
+                            'luggage_rate': luggage_rate,
+                            'start': start,
+                            'size': min(unit_size, n_replicates - start),
+                        })
+    return units
+
+def _write_json(path, data):
+    """
+    Replace a JSON file atomically, so a crash leaves the old or the new
+    version but never a partial one.
+    """
+    staging = Path(f"{path}.tmp")
+    with open(staging, 'w') as f:
+        json.dump(data, f, indent=1)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(staging, path)
+
+def run_unit(unit, seed_sequence, **sim_params):
+    """
+    Simulate one work unit from its own SeedSequence. Returns the
+    completion ticks of its replicates and the initial state of the bit
+    generator the unit draws from.
+    """
+    layout = LAYOUTS[unit['layout']]
+    rank = strategy_assignment(unit['strategy'], layout).rank
+
+    # boarding_batches draws the unit (a single batch) from the first child
+    stream = np.random.SeedSequence(seed_sequence.entropy, spawn_key=seed_sequence.spawn_key + (0,))
+    rng_state = np.random.default_rng(stream).bit_generator.state
+    ((_, _, _, seated_at),) = boarding_batches(
+        layout, rank, unit['size'], seed=seed_sequence, batch_size=unit['size'],
+        luggage_rate=unit['luggage_rate'], load_factor=unit['load_factor'], **sim_params)
+    return seated_at.max(axis=1, initial=0).astype(np.int32), rng_state
+
+def run_sweep(store, checkpoint, units, seed=0, max_units=None, **sim_params):
+    """
+    Run the work units of plan_sweep that are not finished yet, appending
+    each unit's completion ticks to the store's 'runs' table (tagged with
+    its layout, strategy, load_factor, luggage_rate, seed and unit id) and
+    recording it in the checkpoint JSON file.
+
+    Unit i always draws from SeedSequence(seed, spawn_key=(i,)), whose
+    entropy and spawn key are saved in the checkpoint together with the
+    generator state, so a resumed sweep gives bit-identical results to an
+    uninterrupted one. A unit that reached the store but not the
+    checkpoint (crash in between) is taken from the store rather than run
+    twice. max_units stops after that many units, e.g. for time-boxed
+    jobs. Returns the number of units run in this call.
+    """
+    store = store if isinstance(store, ResultsStore) else ResultsStore(store)
+    sweep = {'seed': seed, 'units': [unit['id'] for unit in units], 'sim_params': sim_params}
+    if os.path.exists(checkpoint):
+        with open(checkpoint) as f:
+            state = json.load(f)
+        if state['sweep'] != json.loads(json.dumps(sweep)):
+            raise ValueError(f"checkpoint {checkpoint} belongs to a different sweep")
+    else:
+        state = {'sweep': sweep, 'completed': {}}
+
+    # Units whose results were stored after the last checkpoint write
+    stored = {manifest['tags']['unit']: manifest['tags']
+              for manifest in store.chunks('runs', seed=seed) if 'unit' in manifest['tags']}
+
+    n_run = 0
+    for index, unit in enumerate(units):
+        if unit['id'] in state['completed']:
+            continue
+        seed_sequence = np.random.SeedSequence(seed, spawn_key=(index,))
+        record = {'entropy': seed_sequence.entropy, 'spawn_key': list(seed_sequence.spawn_key)}
+
+        if unit['id'] in stored:
+            record['rng_state'] = stored[unit['id']]['rng_state']
+        else:
+            if max_units is not None and n_run >= max_units:
+                break
+            ticks, record['rng_state'] = run_unit(unit, seed_sequence, **sim_params)
+            tags = {key: unit[key] for key in ('layout', 'strategy', 'load_factor', 'luggage_rate')}
+            store.append('runs', {'replicate': np.arange(unit['start'], unit['start'] + unit['size'],
+                                                         dtype=np.int32),
+                                  'ticks': ticks},
+                         seed=seed, unit=unit['id'], rng_state=record['rng_state'], **tags)
+            n_run += 1
+
+        state['completed'][unit['id']] = record
+        _write_json(checkpoint, state)
+    return n_run
+
+if __name__ == "__main__":
+    import sys
+
+    from models.results_store import summarize_runs
+
+    store = ResultsStore(sys.argv[1] if len(sys.argv) > 1 else 'results')
+    checkpoint = sys.argv[2] if len(sys.argv) > 2 else 'sweep_checkpoint.json'
+
+    units = plan_sweep(layouts=('b737', 'a350'), load_factors=(0.7, 0.85, 1.0),
+                       luggage_rates=(0.5, 0.8), n_replicates=2000, unit_size=500)
+    n_run = run_sweep(store, checkpoint, units, seed=2024)
+    print(f"{n_run} of {len(units)} units run, the rest resumed from {checkpoint}")
+
+    by = ('layout', 'strategy', 'load_factor', 'luggage_rate')
+    for key, summary in sorted(summarize_runs(store, by=by, seed=2024).items()):
+        print(f"{'/'.join(map(str, key))}: {summary['mean']:.2f} minutes (n={summary['n']})")
@@ -0,0 +1,119 @@
+from statistics import NormalDist
+
+import numpy as np
+
+from models.boarding_simulation import SECONDS_PER_TICK, run_common
+
+def passengers_from_uniforms(uniforms, luggage_rate=0.8, stow_ticks=(6, 20)):
+    """
+    Turn a (replicates x seats x 3) array of uniforms in [0, 1) into the
+    passenger attributes of each seat: its tie-breaking key within its
+    boarding group and its stowing ticks (luggage or not, and how long).
+    Each attribute is a monotone function of one uniform, so 1 - u gives
+    the antithetic passenger.
+    """
+    ties, luggage, duration = np.moveaxis(uniforms, -1, 0)
+    low, high = stow_ticks
+    stow = np.where(luggage < luggage_rate,
+                    low + np.minimum((duration * (high - low + 1)).astype(int), high - low), 1)
+    return ties, stow
+
+def compare_strategies(layout, ranks, target_width=0.1, confidence=0.95, common=True,
+                       antithetic=True, batch_size=200, max_replicates=50000, seed=0,
+                       luggage_rate=0.8, stow_ticks=(6, 20), shuffle_ticks=6):
+    """
+    Compare boarding strategies, given as {name: (rows x seats) rank
+    array}, by their difference in mean boarding time to the first one.
+
+    With common=True every strategy boards the same passengers in each
+    replicate (common random numbers), so the noise the strategies share
+    cancels out of the differences. With antithetic=True replicates come
+    in pairs drawn from u and 1 - u, and each pair's average is one
+    sample. Batches of batch_size replicates per strategy are added until
+    the confidence interval of every difference is narrower than
+    target_width minutes, or max_replicates is reached.
+
+    Returns the mean and std in minutes per strategy, the difference to
+    the first strategy with its confidence interval, the number of
+    replicates per strategy, whether the target was met and the
+    'speedup': replicates that independent sampling would need for the
+    same interval widths, divided by the replicates used.
+    """
+    names = list(ranks)
+    flat = np.array([np.asarray(ranks[name]).ravel() for name in names])
+    n_strategies, n_seats = flat.shape
+    rng = np.random.default_rng(seed)
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    group = 2 if antithetic else 1
+    n_draws = max(1, batch_size // group)
+
+    samples = []  # (strategies x samples) minutes per batch
+    raw = []  # (strategies x replicates) minutes per batch, for the speedup
+    n_replicates = 0
+    while True:
+        shape = (n_draws if common else n_strategies * n_draws, n_seats, 3)
+        uniforms = rng.random(shape)
+        if antithetic:
+            # Each draw followed by its mirror image
+            uniforms = np.stack([uniforms, 1 - uniforms], axis=1).reshape(-1, n_seats, 3)
+        ties, stow = passengers_from_uniforms(uniforms, luggage_rate, stow_ticks)
+
+        if common:
+            ticks = run_common(layout, flat, ties, stow, shuffle_ticks)
+        else:
+            size = len(ties) // n_strategies
+            ticks = np.array([run_common(layout, flat[i:i + 1], ties[i * size:(i + 1) * size],
+                                         stow[i * size:(i + 1) * size], shuffle_ticks)[0]
+                              for i in range(n_strategies)])
+        minutes = ticks * SECONDS_PER_TICK / 60
+        raw.append(minutes)
+        samples.append(minutes.reshape(n_strategies, -1, group).mean(axis=2))
+        n_replicates += minutes.shape[1]
+
+        # Interval of each difference to the first strategy
+        values = np.concatenate(samples, axis=1)
+        differences = values[1:] - values[0]
+        n = values.shape[1]
+        half_width = z * differences.std(axis=1, ddof=1) / np.sqrt(n) if n > 1 else np.inf
+        converged = bool(np.all(2 * half_width <= target_width))
+        if converged or n_replicates >= max_replicates:
+            break
+
+    # Independent sampling needs z^2 (var_a + var_b) / h^2 replicates per strategy for width 2h
+    minutes = np.concatenate(raw, axis=1)
+    variance = minutes.var(axis=1, ddof=1)
+    independent = z ** 2 * (variance[1:] + variance[0]) / np.maximum(half_width, 1e-12) ** 2
+    return {
+        'replicates': n_replicates,
+        'converged': converged,
+        'strategies': {name: {'mean': minutes[i].mean(), 'std': np.sqrt(variance[i])}
+                       for i, name in enumerate(names)},
+        'differences': {name: {'mean': differences[i - 1].mean(),
+                               'ci': (differences[i - 1].mean() - half_width[i - 1],
+                                      differences[i - 1].mean() + half_width[i - 1])}
+                        for i, name in enumerate(names) if i > 0},
+        'speedup': float(independent.max() / n_replicates),
+    }
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    from models.cabin_layout import LAYOUTS
+    from models.seat_assignments import strategy_assignment
+
+    layout = LAYOUTS[sys.argv[1] if len(sys.argv) > 1 else 'b737']
+    ranks = {name: strategy_assignment(name, layout).rank for name in ('back_to_front', 'hybrid')}
+
+    modes = [('independent', False, False), ('common random numbers', True, False),
+             ('common + antithetic', True, True)]
+    for label, common, antithetic in modes:
+        start = time.perf_counter()
+        result = compare_strategies(layout, ranks, target_width=0.1, common=common,
+                                    antithetic=antithetic)
+        difference = result['differences']['hybrid']
+        low, high = difference['ci']
+        print(f"{label}: hybrid - back_to_front = {difference['mean']:.2f} minutes "
+              f"(95% CI {low:.2f} to {high:.2f}) after {result['replicates']} replicates "
+              f"per strategy in {time.perf_counter() - start:.1f} s, "
+              f"{result['speedup']:.1f}x fewer than independent sampling")
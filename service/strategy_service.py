@@ -0,0 +1,236 @@
+"""
+Local HTTP service for evaluating boarding strategies.
+
+    python -m service.strategy_service [port]
+
+    GET /evaluate?layout=b737&strategy=hybrid&load_factor=0.85&replicates=2000&seed=0
+        boarding-time distribution in minutes (JSON)
+    GET /seatmap?layout=b737&strategy=hybrid&dpi=100
+        seat chart of a strategy (PNG); strategy=layout for the plain cabin
+
+Simulations and renders run in a process pool so the event loop keeps
+serving. Results and images are kept in an LRU cache keyed by a hash of
+the normalized parameters, and concurrent identical requests share one
+computation. The X-Cache response header says whether a response was a
+cache 'hit', 'shared' with a request already in flight, or a 'miss'.
+"""
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import json
+from pathlib import Path
+import tempfile
+from urllib.parse import parse_qsl, urlsplit
+
+from models.boarding_simulation import simulate_boarding_batch
+from models.cabin_layout import LAYOUTS
+from models.seat_assignments import STRATEGIES, strategy_assignment
+
+# Seat chart drawn for each strategy, by its name in build_charts.CHARTS
+SEAT_MAPS = {
+    'layout': 'aircraft_layout',
+    'back_to_front': 'back_to_front_strategy',
+    'outside_in': 'outside_in_strategy',
+    'hybrid': 'hybrid_strategy',
+    'random': 'random_boarding',
+}
+
+MAX_REPLICATES = 100000
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+            500: 'Internal Server Error'}
+
+def evaluate(layout, strategy, load_factor, replicates, seed):
+    """
+    Boarding-time distribution of a strategy, as JSON-ready values.
+    """
+    rank = strategy_assignment(strategy, LAYOUTS[layout]).rank
+    result = simulate_boarding_batch(LAYOUTS[layout], rank, replicates, seed=seed,
+                                     load_factor=load_factor)
+    return {
+        'layout': layout,
+        'strategy': strategy,
+        'load_factor': load_factor,
+        'n': result['n'],
+        'mean': result['mean'],
+        'std': result['std'],
+        'percentiles': {str(q): value for q, value in result['percentiles'].items()},
+        'ci': list(result['ci']),
+        'confidence': result['confidence'],
+    }
+
+def render_seat_map(layout, strategy, dpi):
+    """
+    PNG bytes of the seat chart of a strategy, rendered in a scratch
+    directory so nothing is left in the working directory.
+    """
+    from visualizations.build_charts import CHARTS
+
+    chart, _, outputs = CHARTS[SEAT_MAPS[strategy]]
+    with tempfile.TemporaryDirectory() as directory:
+        chart(LAYOUTS[layout], dpi=dpi, output_dir=directory)
+        return (Path(directory) / outputs[0]).read_bytes()
+
+def _number(params, name, kind, default, low, high):
+    try:
+        value = kind(params.get(name, default))
+    except ValueError:
+        raise ValueError(f"{name} must be a number") from None
+    if not low <= value <= high:
+        raise ValueError(f"{name} must be between {low} and {high}")
+    return value
+
+def _choice(params, name, choices, default):
+    value = params.get(name, default)
+    if value not in choices:
+        raise ValueError(f"{name} must be one of {', '.join(choices)}")
+    return value
+
+def parse_request(path, params):
+    """
+    Validate and normalize the query of an endpoint. Returns the worker
+    function and its keyword arguments; raises KeyError for an unknown
+    path and ValueError for bad parameters.
+    """
+    layout = _choice(params, 'layout', list(LAYOUTS), 'b737')
+    if path == '/evaluate':
+        return evaluate, {
+            'layout': layout,
+            'strategy': _choice(params, 'strategy', list(STRATEGIES), 'hybrid'),
+            'load_factor': _number(params, 'load_factor', float, 1.0, 0.01, 1.0),
+            'replicates': _number(params, 'replicates', int, 2000, 1, MAX_REPLICATES),
+            'seed': _number(params, 'seed', int, 0, 0, 2**63 - 1),
+        }
+    if path == '/seatmap':
+        return render_seat_map, {
+            'layout': layout,
+            'strategy': _choice(params, 'strategy', list(SEAT_MAPS), 'hybrid'),
+            'dpi': _number(params, 'dpi', int, 100, 20, 600),
+        }
+    raise KeyError(path)
+
+def _call(function, kwargs):
+    return function(**kwargs)
+
+class LRUCache:
+    """
+    Dict-like cache holding the max_entries most recently used items.
+    """
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._items = OrderedDict()
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def get(self, key):
+        self._items.move_to_end(key)
+        return self._items[key]
+
+    def put(self, key, value):
+        self._items[key] = value
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_entries:
+            self._items.popitem(last=False)
+
+class StrategyService:
+    """
+    asyncio HTTP handler with a result cache, in-flight request sharing
+    and a process pool for the computations.
+    """
+    def __init__(self, max_workers=None, cache_size=256):
+        self.pool = ProcessPoolExecutor(max_workers=max_workers)
+        self.cache = LRUCache(cache_size)
+        self._in_flight = {}
+
+    async def compute(self, function, kwargs):
+        """
+        Result of function(**kwargs) and how it was obtained ('hit',
+        'shared' or 'miss').
+        """
+        key = hashlib.sha256(json.dumps([function.__name__, kwargs], sort_keys=True)
+                             .encode()).hexdigest()
+        if key in self.cache:
+            return self.cache.get(key), 'hit'
+        if key in self._in_flight:
+            return await asyncio.shield(self._in_flight[key]), 'shared'
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.pool, _call, function, kwargs)
+        self._in_flight[key] = future
+        try:
+            result = await asyncio.shield(future)
+        finally:
+            del self._in_flight[key]
+        self.cache.put(key, result)
+        return result, 'miss'
+
+    async def handle(self, reader, writer):
+        """
+        Serve one HTTP/1.1 GET request and close the connection.
+        """
+        try:
+            request = await reader.readline()
+            while (await reader.readline()).strip():
+                pass  # Headers are not needed
+            method, target, _ = request.decode('latin-1').split(' ', 2)
+            status, body, content_type, source = await self._respond(method, urlsplit(target))
+        except ValueError:
+            status, body, content_type, source = 400, {'error': 'malformed request'}, None, None
+
+        if content_type is None:
+            body = json.dumps(body).encode()
+            content_type = 'application/json'
+        head = [f"HTTP/1.1 {status} {_REASONS[status]}",
+                f"Content-Type: {content_type}",
+                f"Content-Length: {len(body)}",
+                "Connection: close"]
+        if source is not None:
+            head.append(f"X-Cache: {source}")
+        writer.write(('\r\n'.join(head) + '\r\n\r\n').encode() + body)
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def _respond(self, method, url):
+        """
+        Status, body, content type (None for JSON) and cache source of a request.
+        """
+        if method != 'GET':
+            return 405, {'error': 'only GET is supported'}, None, None
+        try:
+            function, kwargs = parse_request(url.path, dict(parse_qsl(url.query)))
+        except KeyError:
+            return 404, {'error': f"unknown path {url.path}"}, None, None
+        except ValueError as error:
+            return 400, {'error': str(error)}, None, None
+        try:
+            result, source = await self.compute(function, kwargs)
+        except Exception as error:
+            return 500, {'error': f"{type(error).__name__}: {error}"}, None, None
+        if function is render_seat_map:
+            return 200, result, 'image/png', source
+        return 200, result, None, source
+
+    async def serve(self, host='127.0.0.1', port=8080):
+        """
+        Serve until cancelled, then shut down the worker pool.
+        """
+        server = await asyncio.start_server(self.handle, host, port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.pool.shutdown(cancel_futures=True)
+
+if __name__ == "__main__":
+    import sys
+
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8080
+    print(f"Serving on http://127.0.0.1:{port}/evaluate and /seatmap")
+    try:
+        asyncio.run(StrategyService().serve(port=port))
+    except KeyboardInterrupt:
+        pass
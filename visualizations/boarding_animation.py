@@ -0,0 +1,242 @@
+from matplotlib.animation import AbstractMovieWriter, FFMpegWriter
+import numpy as np
+
+from models.boarding_simulation import boarding_sequence, sample_stow_ticks
+from models.cabin_layout import BOEING_737_800
+from models.event_simulation import run_boarding_events
+from visualizations.seat_map import draw_cabin, draw_seats, new_figure, seat_positions
+
+# Aisle cell states in the frames
+FREE = 0
+WALKING = 1
+AT_ROW = 2  # Stowing luggage or waiting for seated passengers to get up
+
+def boarding_frames(layout, rank, rng=None, ticks_per_frame=1, luggage_rate=0.8,
+                    stow_ticks=(6, 20), shuffle_ticks=6):
+    """
+    Simulate one boarding with the event-driven engine and replay it,
+    yielding the cabin state every ticks_per_frame ticks until everyone
+    is seated.
+
+    Each frame is (tick, seated, aisle): the (rows, cols) indices of the
+    seats taken since the previous frame and an (aisles x rows) array of
+    FREE/WALKING/AT_ROW cells. Only the event trace of the boarding is
+    kept, never past frames.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+
+    target, seat_col = boarding_sequence(rank, rng)
+    stow = sample_stow_ticks(rng, target.shape, luggage_rate, stow_ticks)
+    trace = []
+    run_boarding_events(layout, target, seat_col, stow, shuffle_ticks, trace)
+    trace.sort(key=lambda event: event[0])
+
+    lane = layout.seat_aisle[seat_col]
+    position = np.full(len(target), -1)
+    aisle = np.zeros((layout.n_aisles, layout.n_rows), dtype=np.int8)
+    end = trace[-1][0] if trace else 0
+    next_event = 0
+
+    for tick in range(0, end + ticks_per_frame, ticks_per_frame):
+        seated = []
+        while next_event < len(trace) and trace[next_event][0] <= tick:
+            _, p, cell = trace[next_event]
+            next_event += 1
+            if position[p] >= 0:
+                aisle[lane[p], position[p]] = FREE
+            position[p] = cell
+            if cell < 0:
+                seated.append(p)
+            else:
+                aisle[lane[p], cell] = AT_ROW if cell == target[p] else WALKING
+        yield tick, (target[seated], seat_col[seated]), aisle.copy()
+
+def _seat_squares(layout, rows, cols):
+    """
+    Corners of the seat squares at the given (rows, cols) indices.
+    """
+    x, y = seat_positions(layout)
+    corners = np.array([[-0.4, -0.4], [0.4, -0.4], [0.4, 0.4], [-0.4, 0.4]])
+    return np.stack([x[rows, cols], y[rows, cols]], axis=-1)[:, None, :] + corners
+
+def _writer_for(filename, fps, colors):
+    """
+    Streaming writer for a file name: GIF through Pillow, anything else
+    through ffmpeg.
+    """
+    if str(filename).lower().endswith('.gif'):
+        return StreamingGifWriter(fps=fps, colors=colors)
+    writer = BlitFFMpegWriter(fps=fps)
+    if not writer.isAvailable():
+        raise RuntimeError("ffmpeg is required for video output; use a .gif file name instead")
+    return writer
+
+def export_boarding_animation(layout, rank, filename, rng=None, fps=10, ticks_per_frame=1,
+                              dpi=100, writer=None, title='Boarding Simulation', **sim_params):
+    """
+    Render a simulated boarding of a (rows x seats) rank array, e.g.
+    SeatAssignment.rank, to a GIF or MP4: seats fill in with the color of
+    their boarding group and aisle cells show who is walking (blue) or
+    blocking the aisle at their row (red).
+
+    Frames come from boarding_frames and go straight to the writer. The
+    static cabin is drawn once; each frame restores it, draws only the
+    seats taken since the last frame (which then become part of the
+    saved background), the aisle markers and the clock, and hands the
+    canvas buffer to the writer, so memory stays flat however long the
+    boarding. Returns the number of frames written.
+    """
+    import matplotlib
+    from matplotlib.collections import PolyCollection
+
+    fig = new_figure(figsize=(8, 10) if layout.n_cols <= 6 else (12, 10))
+    fig.set_dpi(dpi)
+    ax = fig.subplots()
+
+    # Empty cabin, plus the artists that change every frame
+    empty = np.broadcast_to(matplotlib.colors.to_rgba('lightgray'), (layout.n_rows, layout.n_cols, 4))
+    draw_seats(ax, layout, empty, labels=False)
+    draw_cabin(ax, layout)
+    ax.set_title(title, fontsize=16, pad=20)
+    # Leave a strip along the bottom for the clock
+    fig.tight_layout(rect=(0, 0.04, 1, 1))
+
+    rows = layout.n_rows - np.arange(layout.n_rows) - 0.5
+    aisle_x, aisle_y = np.meshgrid(layout.aisle_x, rows, indexing='ij')
+    markers = ax.scatter([], [], s=60, zorder=4, animated=True)
+    clock = fig.text(0.02, 0.01, '', ha='left', va='bottom', fontsize=12,
+                     fontweight='bold', animated=True)
+    state_colors = np.array([[0, 0, 0, 0], matplotlib.colors.to_rgba('tab:blue'),
+                             matplotlib.colors.to_rgba('tab:red')])
+    group_colors = matplotlib.colormaps['tab10'](np.asarray(rank) % 10)
+    if writer is None:
+        colors = np.concatenate([[[1, 1, 1, 1]], state_colors[1:], group_colors.reshape(-1, 4)])
+        writer = _writer_for(filename, fps, colors)
+
+    n_frames = 0
+    with writer.saving(fig, filename, dpi):
+        canvas = fig.canvas
+        canvas.draw()
+        background = canvas.copy_from_bbox(fig.bbox)
+
+        frames = boarding_frames(layout, rank, rng, ticks_per_frame, **sim_params)
+        for tick, (seat_rows, seat_cols), aisle in frames:
+            canvas.restore_region(background)
+
+            # Newly taken seats are drawn once and kept in the background
+            if len(seat_rows):
+                colors = group_colors[seat_rows, seat_cols]
+                seats = PolyCollection(_seat_squares(layout, seat_rows, seat_cols),
+                                       facecolors=colors, edgecolors=colors, linewidths=1,
+                                       transform=ax.transData)
+                seats.set_figure(fig)
+                ax.draw_artist(seats)
+                background = canvas.copy_from_bbox(fig.bbox)
+
+            busy = aisle != 0
+            markers.set_offsets(np.column_stack([aisle_x[busy], aisle_y[busy]]))
+            markers.set_facecolors(state_colors[aisle[busy]])
+            clock.set_text(f"{tick // 60:02d}:{tick % 60:02d}  "
+                           f"{busy.sum()} in aisle, {(aisle == AT_ROW).sum()} blocking")
+            ax.draw_artist(markers)
+            fig.draw_artist(clock)
+            canvas.blit(fig.bbox)
+            writer.grab_frame()
+            n_frames += 1
+
+    return n_frames
+
+def _frame_image(fig):
+    """
+    Current Agg canvas of a figure as a Pillow image, without re-rendering.
+    """
+    from PIL import Image
+
+    buffer = fig.canvas.buffer_rgba()
+    return Image.frombuffer('RGBA', (buffer.shape[1], buffer.shape[0]), buffer, 'raw', 'RGBA', 0, 1)
+
+class BlitFFMpegWriter(FFMpegWriter):
+    """
+    FFMpegWriter that pipes the canvas buffer to ffmpeg as it is: going
+    through savefig would redraw the whole figure and drop blitted artists.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.frame_format = 'rgba'
+
+    def grab_frame(self, **savefig_kwargs):
+        self._proc.stdin.write(self.fig.canvas.buffer_rgba())
+
+class StreamingGifWriter(AbstractMovieWriter):
+    """
+    GIF writer that encodes and writes every frame as it is grabbed;
+    matplotlib's PillowWriter keeps all frames until the end instead.
+
+    All frames share one palette, built from the first frame plus the
+    given RGBA colors (those of artists that only show up later), and
+    only the part of a frame that differs from the previous one is stored.
+    """
+    def __init__(self, fps=5, metadata=None, codec=None, bitrate=None, colors=()):
+        super().__init__(fps, metadata, codec, bitrate)
+        self.colors = colors
+
+    def setup(self, fig, outfile, dpi=None):
+        super().setup(fig, outfile, dpi)
+        self._file = open(outfile, 'wb')
+        self._palette = None
+        self._previous = None
+
+    def grab_frame(self, **savefig_kwargs):
+        from PIL import GifImagePlugin, Image
+
+        frame = _frame_image(self.fig).convert('RGB')
+        if self._palette is None:
+            # Give the extra colors enough weight to get palette entries
+            colors = np.unique(np.asarray(self.colors, dtype=float).reshape(-1, 4)[:, :3], axis=0)
+            swatch = np.repeat(colors, 1000, axis=0)
+            pixels = np.concatenate([np.asarray(frame).reshape(-1, 3),
+                                     (swatch * 255).round().astype(np.uint8)])
+            self._palette = Image.fromarray(pixels[None]).quantize(method=Image.Quantize.FASTOCTREE)
+        frame = frame.quantize(palette=self._palette, dither=Image.Dither.NONE)
+        indices = np.asarray(frame)
+
+        if self._previous is None:
+            header, _ = GifImagePlugin.getheader(frame, info={'loop': 0})
+            self._file.write(b''.join(header))
+            box = (0, 0) + frame.size
+        else:
+            changed = indices != self._previous
+            rows = np.flatnonzero(changed.any(axis=1))
+            cols = np.flatnonzero(changed.any(axis=0))
+            box = (0, 0, 1, 1) if len(rows) == 0 else (cols[0], rows[0], cols[-1] + 1, rows[-1] + 1)
+        self._previous = indices
+
+        # Draw the changed box over the previous frame
+        data = GifImagePlugin.getdata(frame.crop(box), offset=box[:2],
+                                      duration=1000 / self.fps, disposal=1)
+        self._file.write(b''.join(data))
+
+    def finish(self):
+        self._file.write(b';')
+        self._file.close()
+
+if __name__ == "__main__":
+    import sys
+    import time
+    import tracemalloc
+
+    from models.cabin_layout import LAYOUTS
+    from models.seat_assignments import strategy_assignment
+
+    names = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    layout = LAYOUTS[names[0]] if names else BOEING_737_800
+    filename = names[1] if len(names) > 1 else 'boarding_animation.gif'
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    n_frames = export_boarding_animation(layout, strategy_assignment('hybrid', layout).rank,
+                                         filename, rng=np.random.default_rng(42))
+    seconds = time.perf_counter() - start
+    print(f"{filename}: {n_frames} frames in {seconds:.1f} s ({n_frames / seconds:.1f} frames/s), "
+          f"peak traced memory {tracemalloc.get_traced_memory()[1] / 2**20:.1f} MiB")
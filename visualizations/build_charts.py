@@ -0,0 +1,179 @@
+"""
+Incremental build of the chart set.
+
+    python -m visualizations.build_charts [layout] [--output DIR] [--force]
+
+Each figure is keyed by a hash of everything it is drawn from: the cabin
+layout, the seat assignment of its strategy, the matplotlib version and
+style settings, the dpi and the source code of the chart's module, of
+the shared seat-map drawing module and of the cabin layout geometry. Keys and the hashes of the files
+written are kept in a manifest in the output directory, and a figure is
+only rendered again when its key changed or its files no longer match.
+Figures are rendered into a staging folder and renamed into place, so the
+output directory never holds a partly written chart.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import inspect
+import json
+import os
+from pathlib import Path
+import shutil
+import tempfile
+import time
+
+from models import cabin_layout
+from models.cabin_layout import BOEING_737_800
+from models.seat_assignments import (
+    back_to_front_assignment, outside_in_assignment, hybrid_assignment)
+from visualizations import seat_map
+from visualizations.aircraft_layout import create_aircraft_seating_chart
+from visualizations.boarding_strategies import (
+    back_to_front_strategy, outside_in_strategy, hybrid_strategy, random_boarding)
+from visualizations.seat_map import target_files
+
+MANIFEST = '.build_manifest.json'
+
+# name: (chart function, seat assignment it draws or None, PNG files it writes)
+CHARTS = {
+    'aircraft_layout': (create_aircraft_seating_chart, None, ('aircraft_layout.png',)),
+    'back_to_front_strategy': (back_to_front_strategy, back_to_front_assignment,
+                               ('back_to_front_strategy.png',)),
+    'outside_in_strategy': (outside_in_strategy, outside_in_assignment,
+                            ('outside_in_strategy.png',)),
+    'hybrid_strategy': (hybrid_strategy, hybrid_assignment,
+                        ('hybrid_strategy.png', 'hybrid_strategy_legend.png')),
+    'random_boarding': (random_boarding, None, ('random_boarding.png',)),
+}
+
+def _style_key():
+    """
+    matplotlib version and the current rcParams, which set fonts, colors
+    and line widths of every figure.
+    """
+    import matplotlib
+
+    return f"{matplotlib.__version__}\n{sorted(matplotlib.rcParams.items())!r}"
+
+def chart_files(name, targets=('png',)):
+    """
+    Files a chart writes for the given output targets.
+    """
+    return [file for output in CHARTS[name][2] for file in target_files(output, targets)]
+
+def chart_key(name, layout, dpi, style=None, targets=('png',)):
+    """
+    Content hash of the inputs of one chart (hex string).
+    """
+    chart, assignment, _ = CHARTS[name]
+    digest = hashlib.sha256()
+    for part in (name, repr(layout), str(dpi), style or _style_key(),
+                 ','.join(chart_files(name, targets)),
+                 inspect.getsource(inspect.getmodule(chart)), inspect.getsource(seat_map),
+                 inspect.getsource(cabin_layout)):
+        digest.update(part.encode())
+        digest.update(b'\0')
+    if assignment is not None:
+        groups, group_order, _ = assignment(layout)
+        digest.update(f"{groups.shape}{group_order}".encode())
+        digest.update(groups.tobytes())
+    return digest.hexdigest()
+
+def _file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _up_to_date(output_dir, entry, key):
+    if entry is None or entry['key'] != key:
+        return False
+    return all((output_dir / filename).is_file()
+               and _file_hash(output_dir / filename) == file_hash
+               for filename, file_hash in entry['outputs'].items())
+
+def _render(name, layout, dpi, output_dir, targets=('png',)):
+    """
+    Render one chart into a fresh staging folder inside output_dir and
+    move its files into place. Returns the name, the hashes of the files
+    written and the wall time in seconds.
+    """
+    chart = CHARTS[name][0]
+    outputs = chart_files(name, targets)
+    start = time.perf_counter()
+    staging = Path(tempfile.mkdtemp(prefix='.build-', dir=output_dir))
+    try:
+        chart(layout, dpi=dpi, output_dir=staging, targets=targets)
+        hashes = {filename: _file_hash(staging / filename) for filename in outputs}
+        for filename in outputs:
+            os.replace(staging / filename, Path(output_dir) / filename)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return name, hashes, time.perf_counter() - start
+
+def build_charts(layout=BOEING_737_800, output_dir='charts', dpi=300, charts=None,
+                 targets=('png',), force=False, parallel=False, max_workers=None):
+    """
+    Bring the charts (all of CHARTS by default) in output_dir up to date,
+    in the formats listed in targets (see seat_map.save_figure),
+    rendering only those whose inputs changed or whose files are missing
+    or modified; force=True renders everything. With parallel=True the
+    stale charts are rendered in a process pool. Returns
+    {name: seconds spent rendering, or None if the chart was up to date}.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = output_dir / MANIFEST
+    manifest = {}
+    if manifest_path.is_file():
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+
+    # Work out which charts are stale before rendering any of them
+    style = _style_key()
+    names = list(CHARTS) if charts is None else list(charts)
+    keys = {name: chart_key(name, layout, dpi, style, targets) for name in names}
+    stale = [name for name in names
+             if force or not _up_to_date(output_dir, manifest.get(name), keys[name])]
+
+    timings = dict.fromkeys(names)
+    args = ([layout] * len(stale), [dpi] * len(stale), [output_dir] * len(stale),
+            [targets] * len(stale))
+    if parallel and len(stale) > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            rendered = list(pool.map(_render, stale, *args))
+    else:
+        rendered = map(_render, stale, *args)
+
+    for name, hashes, seconds in rendered:
+        manifest[name] = {'key': keys[name], 'outputs': hashes}
+        timings[name] = seconds
+
+    # Replace the manifest atomically as well
+    staging = output_dir / f"{MANIFEST}.tmp"
+    with open(staging, 'w') as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(staging, manifest_path)
+    return timings
+
+if __name__ == "__main__":
+    import argparse
+
+    from models.cabin_layout import LAYOUTS
+
+    parser = argparse.ArgumentParser(description="Render the charts whose inputs changed.")
+    parser.add_argument('layout', nargs='?', default='b737', choices=sorted(LAYOUTS))
+    parser.add_argument('--output', default='charts', help="output directory")
+    parser.add_argument('--dpi', type=int, default=300)
+    parser.add_argument('--targets', default='png',
+                        help="comma-separated output formats: png, thumb, svg, pdf")
+    parser.add_argument('--force', action='store_true', help="render every chart")
+    parser.add_argument('--parallel', action='store_true')
+    args = parser.parse_args()
+
+    timings = build_charts(LAYOUTS[args.layout], args.output, args.dpi,
+                           targets=tuple(args.targets.split(',')), force=args.force,
+                           parallel=args.parallel)
+    for name, seconds in timings.items():
+        print(f"{name}: " + ("up to date" if seconds is None else f"{seconds:.2f} s"))
@@ -0,0 +1,120 @@
+import os
+
+import numpy as np
+
+from models.boarding_simulation import SECONDS_PER_TICK
+from models.cabin_layout import BOEING_737_800
+from visualizations.seat_map import (
+    draw_cabin, draw_seats, new_figure, save_figure, seat_positions)
+
+def _colorbar(fig, ax, cmap, norm, label):
+    import matplotlib
+
+    sm = matplotlib.cm.ScalarMappable(norm=norm, cmap=cmap)
+    sm.set_array([])
+    cbar = fig.colorbar(sm, ax=ax, orientation='vertical', pad=0.05)
+    cbar.set_label(label)
+
+def seat_time_heatmap(seat_times, layout=BOEING_737_800, percentile=None, title=None,
+                      filename='seat_time_heatmap.png', dpi=300, output_dir='.',
+                      targets=('png',)):
+    """
+    Color every seat by when its passenger sat down, from the seat_times
+    accumulator of models.seat_statistics.aggregate_boardings: the mean,
+    or the given percentile, in minutes after boarding started.
+    """
+    import matplotlib
+    import matplotlib.colors as mcolors
+
+    # Create figure and axis
+    fig = new_figure(figsize=(12, 10))
+    ax = fig.subplots()
+
+    # Seated time per seat in minutes
+    ticks = seat_times.mean if percentile is None else seat_times.percentile(percentile)
+    minutes = ticks * SECONDS_PER_TICK / 60
+    cmap = matplotlib.colormaps['viridis']
+    norm = mcolors.Normalize(np.nanmin(minutes), np.nanmax(minutes))
+
+    # Plot grid colored by seated time, labeled with the value
+    draw_seats(ax, layout, cmap(norm(minutes)), sublabels=np.char.mod('%.1f', minutes))
+
+    # Draw aisle, axes, column/row labels and the aircraft outline
+    draw_cabin(ax, layout)
+
+    # Set title
+    statistic = 'Mean' if percentile is None else f'{percentile}th Percentile'
+    if title is None:
+        title = f'{statistic} Seated Time ({seat_times.count.max():,} boardings)'
+    ax.set_title(title, fontsize=16, pad=20)
+
+    # Add a colorbar for reference
+    _colorbar(fig, ax, cmap, norm, f'{statistic} seated time (minutes)')
+
+    fig.tight_layout()
+    save_figure(fig, os.path.join(output_dir, filename), dpi, targets)
+
+def congestion_heatmap(congestion, layout=BOEING_737_800, title=None,
+                       filename='aisle_congestion.png', dpi=300, output_dir='.',
+                       targets=('png',)):
+    """
+    Color every aisle cell by the mean time walkers spent waiting to step
+    into it per boarding, from the congestion accumulator of
+    models.seat_statistics.aggregate_boardings. Seats are drawn in gray.
+    """
+    import matplotlib
+    import matplotlib.colors as mcolors
+    from matplotlib.collections import PolyCollection
+
+    # Create figure and axis
+    fig = new_figure(figsize=(12, 10))
+    ax = fig.subplots()
+
+    # Plot the seat grid as background
+    draw_seats(ax, layout, np.tile(mcolors.to_rgba('lightgray'), (layout.n_rows, layout.n_cols, 1)))
+
+    # One cell per aisle and row, colored by waiting seconds per boarding
+    seconds = congestion.mean * SECONDS_PER_TICK
+    cmap = matplotlib.colormaps['inferno_r']
+    norm = mcolors.Normalize(0, np.nanmax(seconds))
+    _, y = seat_positions(layout)
+    x = np.repeat(layout.aisle_x, layout.n_rows)
+    y = np.tile(y[:, 0], layout.n_aisles)
+    corners = np.array([[-0.2, -0.45], [0.2, -0.45], [0.2, 0.45], [-0.2, 0.45]])
+    cells = PolyCollection(np.stack([x, y], axis=-1)[:, None, :] + corners,
+                           facecolors=cmap(norm(seconds.ravel())), edgecolors='none', zorder=2)
+    ax.add_collection(cells, autolim=False)
+
+    # Draw aisle, axes, column/row labels and the aircraft outline
+    draw_cabin(ax, layout)
+
+    # Set title
+    if title is None:
+        title = f'Aisle Congestion ({congestion.count.max():,} boardings)'
+    ax.set_title(title, fontsize=16, pad=20)
+
+    # Add a colorbar for reference
+    _colorbar(fig, ax, cmap, norm, 'Waiting time to enter the aisle cell (seconds per boarding)')
+
+    fig.tight_layout()
+    save_figure(fig, os.path.join(output_dir, filename), dpi, targets)
+
+if __name__ == "__main__":
+    import sys
+
+    from models.cabin_layout import LAYOUTS
+    from models.seat_assignments import strategy_assignment
+    from models.seat_statistics import aggregate_boardings
+
+    layout = LAYOUTS[sys.argv[1] if len(sys.argv) > 1 else 'b737']
+    strategy = sys.argv[2] if len(sys.argv) > 2 else 'hybrid'
+    n_replicates = int(sys.argv[3]) if len(sys.argv) > 3 else 100000
+
+    stats = aggregate_boardings(layout, strategy_assignment(strategy, layout).rank,
+                                n_replicates, seed=42)
+    seat_time_heatmap(stats['seat_times'], layout, filename=f'{strategy}_seat_time_mean.png')
+    seat_time_heatmap(stats['seat_times'], layout, percentile=90,
+                      filename=f'{strategy}_seat_time_p90.png')
+    congestion_heatmap(stats['congestion'], layout, filename=f'{strategy}_aisle_congestion.png')
+    print(f"{strategy}: mean {float(stats['ticks'].mean) * SECONDS_PER_TICK / 60:.2f} minutes "
+          f"over {n_replicates} boardings")
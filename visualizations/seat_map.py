@@ -0,0 +1,240 @@
+from functools import lru_cache
+import io
+import os
+
+import numpy as np
+
+# Points of space between a seat name and its sublabel
+LABEL_GAP = 1.0
+
+# Output targets of save_figure and the suffix each one replaces .png with
+OUTPUT_TARGETS = {'png': '.png', 'thumb': '_thumb.png', 'svg': '.svg', 'pdf': '.pdf'}
+THUMBNAIL_DPI = 40
+
+# zlib level of the raster targets: 3 writes ~20% larger files than the
+# default 6 in ~30% less time
+PNG_COMPRESS_LEVEL = 3
+
+# matplotlib is imported inside the drawing functions so that it is only
+# loaded by code that actually renders
+
+def new_figure(figsize=(12, 10)):
+    """
+    Create a Figure on its own Agg canvas, without going through pyplot,
+    so figures can be built headless and in worker processes.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig
+
+def target_files(filename, targets=('png',)):
+    """
+    Names of the files save_figure writes for a PNG filename and targets.
+    """
+    base = os.path.splitext(filename)[0]
+    return [f"{base}{OUTPUT_TARGETS[target]}" for target in targets]
+
+def save_figure(fig, path, dpi=300, targets=('png',), thumbnail_dpi=THUMBNAIL_DPI):
+    """
+    Write a figure to one or more targets after laying it out once:
+
+    png    raster at dpi, to path
+    thumb  raster at thumbnail_dpi, to path with a _thumb suffix
+    svg    vector, with the .png suffix of path replaced
+    pdf    vector, likewise
+
+    The layout and tight bounding box are computed once and reused for
+    every target. The thumbnail is rasterized straight at its own dpi,
+    which is several times cheaper than scaling the full-resolution
+    pixels down. Each file is encoded in memory and written in one go.
+    Returns the paths written.
+    """
+    unknown = set(targets) - set(OUTPUT_TARGETS)
+    if unknown:
+        raise ValueError(f"unknown output targets: {', '.join(sorted(unknown))}")
+    directory, filename = os.path.split(os.fspath(path))
+    files = [os.path.join(directory, name) for name in target_files(filename, targets)]
+
+    # Same margins as bbox_inches='tight'
+    fig.draw_without_rendering()
+    bbox = fig.get_tightbbox(fig.canvas.get_renderer()).padded(0.1)
+
+    for target, file in zip(targets, files):
+        buffer = io.BytesIO()
+        if target in ('png', 'thumb'):
+            fig.savefig(buffer, format='png', dpi=dpi if target == 'png' else thumbnail_dpi,
+                        bbox_inches=bbox, pil_kwargs={'compress_level': PNG_COMPRESS_LEVEL})
+        else:
+            fig.savefig(buffer, format=target, dpi=dpi, bbox_inches=bbox)
+        with open(file, 'wb') as f:
+            f.write(buffer.getbuffer())
+    return files
+
+def seat_positions(layout):
+    """
+    Centre of every seat of a cabin layout as (rows x cols) x and y arrays.
+    The first row is drawn at the top (front), with a gap for each aisle.
+    """
+    y = layout.n_rows - np.arange(layout.n_rows) - 0.5
+    return np.meshgrid(layout.column_x, y)
+
+@lru_cache(maxsize=4096)
+def _label_path(text, fontsize, weight, ha):
+    """
+    Glyph outline of a label in points, aligned around the origin.
+    """
+    from matplotlib.font_manager import FontProperties
+    from matplotlib.path import Path
+    from matplotlib.textpath import TextPath
+
+    path = TextPath((0, 0), text, size=fontsize, prop=FontProperties(weight=weight))
+    extents = path.get_extents()
+    if ha == 'center':
+        dx = -(extents.x0 + extents.x1) / 2
+    elif ha == 'right':
+        dx = -extents.x1
+    else:
+        dx = -extents.x0
+    dy = -(extents.y0 + extents.y1) / 2
+    return Path(path.vertices + (dx, dy), path.codes)
+
+def draw_labels(ax, texts, x, y, fontsize, weight='normal', ha='center', color='black'):
+    """
+    Draw many text labels as one PathCollection instead of one Text artist
+    each. Labels keep their size in points whatever the axis scale or dpi.
+    """
+    from matplotlib.collections import PathCollection
+    from matplotlib.transforms import IdentityTransform
+
+    texts = list(texts)
+    paths = [_label_path(str(text), fontsize, weight, ha) for text in texts]
+    labels = PathCollection(paths, sizes=[1.0],
+                            offsets=np.column_stack([np.ravel(x), np.ravel(y)]),
+                            offset_transform=ax.transData,
+                            transform=IdentityTransform(),
+                            facecolors=color, edgecolors='none', zorder=3)
+    ax.add_collection(labels, autolim=False)
+    return labels
+
+def seat_pitch(ax, layout):
+    """
+    Height of a row and width of a seat column in points, at the current
+    size of the axes and the limits draw_cabin sets.
+    """
+    box = ax.get_position()
+    fig_width, fig_height = ax.get_figure().get_size_inches()
+    return (box.height * fig_height * 72 / (layout.n_rows + 1),
+            box.width * fig_width * 72 / (layout.width + 0.5))
+
+def _label_size(texts, fontsize):
+    """
+    Width and height in points of the largest of a set of labels.
+    """
+    extents = [_label_path(str(text), fontsize, 'normal', 'center').get_extents()
+               for text in set(texts)]
+    return max(e.width for e in extents), max(e.height for e in extents)
+
+def draw_seats(ax, layout, seat_colors, sublabels=None, labels='auto'):
+    """
+    Draw the whole seat grid as a single PolyCollection, with the seat
+    names ("28A") and optional per-seat sublabels ("Group 1") batched into
+    one collection each.
+
+    seat_colors is a (rows x cols x 4) RGBA array. labels may be True,
+    False or 'auto', which draws the names, and then the sublabels, only
+    if they fit inside a seat at the rendered row height and column width
+    (see seat_pitch), so tall cabins on a fixed-size figure drop them
+    rather than overlap. The name sits above its sublabel, LABEL_GAP
+    points apart.
+    """
+    from matplotlib.collections import PolyCollection
+
+    x, y = seat_positions(layout)
+    x = x.ravel()
+    y = y.ravel()
+
+    # One square per seat, filled and outlined in the seat colour
+    corners = np.array([[-0.4, -0.4], [0.4, -0.4], [0.4, 0.4], [-0.4, 0.4]])
+    verts = np.stack([x, y], axis=-1)[:, None, :] + corners
+    colors = np.reshape(seat_colors, (-1, 4))
+    seats = PolyCollection(verts, facecolors=colors, edgecolors=colors, linewidths=1)
+    ax.add_collection(seats, autolim=False)
+
+    if labels is False:
+        return seats
+    names = [f"{row}{col}" for row in layout.rows for col in layout.columns]
+    sublabels = None if sublabels is None else np.ravel(sublabels)
+    row_pitch, col_pitch = seat_pitch(ax, layout)
+    name_width, name_height = _label_size(names, 8)
+    sub_width, sub_height = (0, 0) if sublabels is None else _label_size(sublabels, 6)
+    if labels == 'auto':
+        # A seat square is 0.8 of the row and column pitch
+        if name_width > 0.8 * col_pitch or name_height > 0.8 * row_pitch:
+            return seats
+        if (sub_width > 0.8 * col_pitch
+                or name_height + LABEL_GAP + sub_height > 0.8 * row_pitch):
+            sublabels = None
+
+    if sublabels is None:
+        draw_labels(ax, names, x, y, fontsize=8)
+    else:
+        # Stack name and sublabel around the seat centre, offsets in data units
+        draw_labels(ax, names, x, y + (sub_height + LABEL_GAP) / 2 / row_pitch, fontsize=8)
+        draw_labels(ax, sublabels, x, y - (name_height + LABEL_GAP) / 2 / row_pitch, fontsize=6)
+    return seats
+
+def draw_cabin(ax, layout):
+    """
+    Draw everything around the seats: aisles, column and row labels,
+    exit rows, doors, FRONT/BACK markers, boarding direction arrow and the
+    aircraft outline.
+    """
+    from matplotlib.patches import Rectangle
+
+    n_rows = layout.n_rows
+    width = layout.width
+    middle = np.mean(layout.aisle_x)
+
+    # Draw aisles
+    for aisle_x in layout.aisle_x:
+        ax.plot([aisle_x, aisle_x], [0, n_rows + 1], 'k--', alpha=0.5)
+
+    # Set axis limits and hide regular axes
+    ax.set_xlim(-0.5, width)
+    ax.set_ylim(-0.5, n_rows + 0.5)
+    ax.set_xticks([])
+    ax.set_yticks([])
+
+    # Column labels at top, row labels on left side (exit rows in red)
+    x, y = seat_positions(layout)
+    draw_labels(ax, layout.columns, x[0], np.full(layout.n_cols, n_rows + 0.2),
+                fontsize=10, weight='bold')
+    exit_row = np.isin(layout.rows, layout.exit_rows)
+    row_colors = np.where(exit_row[:, None], [[0.8, 0, 0, 1]], [[0, 0, 0, 1]])
+    draw_labels(ax, layout.rows, np.full(n_rows, -0.2), y[:, 0],
+                fontsize=10, weight='bold', ha='right', color=row_colors)
+
+    # Mark exits on both sides of the fuselage and doors on the left
+    for row in layout.exit_rows:
+        row_y = y[layout.row_index[row], 0]
+        ax.plot([-0.5, width - 0.5], [row_y + 0.5, row_y + 0.5], color='red', alpha=0.3)
+    for row in layout.doors:
+        row_y = y[layout.row_index[row], 0]
+        ax.text(-0.9, row_y, 'DOOR', ha='right', va='center', fontsize=8,
+                fontweight='bold', color='darkred')
+
+    # Add front/back indicators
+    ax.text(middle, -0.5, "BACK", ha='center', fontsize=12, fontweight='bold')
+    ax.text(middle, n_rows + 0.5, "FRONT", ha='center', fontsize=12, fontweight='bold')
+
+    # Add arrows showing boarding direction
+    ax.arrow(width + 1, n_rows/2, 0, -2, head_width=0.3, head_length=0.3, fc='black', ec='black')
+    ax.text(width + 1.3, n_rows/2, 'Boarding Direction', va='center')
+
+    # Border around entire aircraft
+    aircraft_outline = Rectangle((-0.5, -0.5), width, n_rows + 1, fill=False,
+                                 edgecolor='gray', linewidth=2, linestyle='-')
+    ax.add_patch(aircraft_outline)
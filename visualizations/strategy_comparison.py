@@ -0,0 +1,74 @@
+import os
+
+import numpy as np
+
+from models.results_store import summarize_runs
+from visualizations.seat_map import new_figure, save_figure
+
+STRATEGY_NAMES = {
+    'back_to_front': 'Back-to-Front',
+    'outside_in': 'Outside-In',
+    'hybrid': 'Hybrid',
+    'random': 'Random',
+}
+
+def strategy_comparison(store, layout='b737', dpi=300, filename='strategy_comparison.png',
+                        output_dir='.', targets=('png',), **filters):
+    """
+    Compare boarding strategies on one layout from the summaries in a
+    ResultsStore: mean boarding time with its confidence interval, and
+    the 90th percentile. Nothing is simulated here; record runs first
+    with models.results_store.record_boardings.
+    """
+    import matplotlib
+
+    summaries = summarize_runs(store, by='strategy', layout=layout, **filters)
+    if not summaries:
+        raise ValueError(f"no runs stored for layout {layout!r}")
+    strategies = [s for s in STRATEGY_NAMES if s in summaries] + sorted(
+        s for s in summaries if s not in STRATEGY_NAMES)
+
+    # Create figure and axis
+    fig = new_figure(figsize=(10, 6))
+    ax = fig.subplots()
+
+    means = np.array([summaries[s]['mean'] for s in strategies])
+    errors = np.array([[m - summaries[s]['ci'][0], summaries[s]['ci'][1] - m]
+                       for s, m in zip(strategies, means)]).T
+    p90 = [summaries[s]['percentiles'][90] for s in strategies]
+    x = np.arange(len(strategies))
+    colors = matplotlib.colormaps['tab10'](x % 10)
+
+    # Mean with confidence interval, P90 as a marker
+    ax.bar(x, means, yerr=errors, color=colors, capsize=6, label='Mean')
+    ax.scatter(x, p90, color='black', marker='_', s=600, zorder=3, label='90th percentile')
+    for i, s in enumerate(strategies):
+        ax.text(i, means[i] / 2, f"{means[i]:.1f} min\n(n={summaries[s]['n']})",
+                ha='center', va='center', color='white', fontweight='bold')
+
+    ax.set_xticks(x, [STRATEGY_NAMES.get(s, s) for s in strategies])
+    ax.set_ylabel('Boarding time (minutes)')
+    ax.set_title(f'Boarding Strategy Comparison ({layout})', fontsize=16, pad=20)
+    ax.legend(loc='upper right', framealpha=0.7)
+
+    fig.tight_layout()
+    save_figure(fig, os.path.join(output_dir, filename), dpi, targets)
+    return summaries
+
+if __name__ == "__main__":
+    import sys
+
+    from models.results_store import ResultsStore, record_boardings
+
+    store = ResultsStore(sys.argv[1] if len(sys.argv) > 1 else 'results')
+    layout = sys.argv[2] if len(sys.argv) > 2 else 'b737'
+
+    # Simulate only the strategies the store has no runs for yet
+    stored = {manifest['tags']['strategy'] for manifest in store.chunks('runs', layout=layout)}
+    for strategy in STRATEGY_NAMES:
+        if strategy not in stored:
+            record_boardings(store, layout, strategy, 10000, seed=42)
+
+    for strategy, summary in strategy_comparison(store, layout).items():
+        print(f"{STRATEGY_NAMES.get(strategy, strategy)}: {summary['mean']:.2f} minutes "
+              f"(P90 {summary['percentiles'][90]:.2f}, n={summary['n']})")